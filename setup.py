@@ -44,6 +44,13 @@ setup(
     packages=find_packages(exclude=['tests']),
     include_package_data=True,
     install_requires=['sphinx>=1.6'],
+    entry_points={
+        'console_scripts': [
+            'sphinx-wiki-lint = sphinxcontrib.wiki.lint:main',
+            'sphinx-wiki-preview = sphinxcontrib.wiki.preview:main',
+            'sphinx-wiki-watch = sphinxcontrib.wiki.watch:main',
+        ],
+    },
     extras_require={
         'tests': [
             'flake8',
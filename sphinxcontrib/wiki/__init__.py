@@ -0,0 +1,2853 @@
+# -*- coding: utf-8 -*-
+"""
+Allow wiki pages to be automatically generated from docstrings.
+
+.. wikisection:: intro
+    :title: Basic usage
+
+    ``sphinxcontrib-wiki`` is a Sphinx_ extension which allows wiki pages to be
+    automatically generated from docstrings. Here is an example:
+
+    .. _Sphinx: http://www.sphinx-doc.org/
+
+    .. code-block:: rst
+
+      .. wikisection:: example
+          :title: Example wiki section title
+
+          Wiki sections must have a body or they are ignored.
+
+
+    Wiki pages are generated like this:
+
+    .. code-block:: rst
+
+      .. wikipage:: example
+          :title: Example wiki section
+
+          Body of a wiki page appears above all its sections.
+
+.. wikisection:: intro
+    :title: Section Hierarchy
+
+    By default, the structure of the ``wikisection`` tree within a ``wikipage``
+    is determined by module hierarchy, namely:
+
+    - Sections within a module are treated as siblings in the order they
+      appear regardless of the depth of the class or function they belong to.
+    - Sections within sibling modules are treated as siblings in _alphabetic_
+      order (and not as they are processed as per ``autodoc_member_order``).
+    - Sections within a package are treated as the parent of those in modules
+      immediately within it.
+
+    Alternatively, a section can force its parent to a be specific other
+    section, for instance:
+
+    .. code-block:: rst
+
+      .. wikisection:: example
+          :title: A section with forced parent
+          :parent: Example wiki section title
+
+          Mandatory section body.
+
+.. wikisection:: intro
+    :title: Section Search
+
+    Sphinx's own search index points to whole documents, so a search for the
+    title of a wiki section lands on the page hosting it with no anchor. With
+    ``wiki_search_index = True`` the HTML builders additionally write a
+    compact, gzip-compressed index of all wiki sections (title and body terms
+    to section anchor) to ``_static/wikisearch.json.gz``. The accompanying
+    ``_static/wikisearch.js`` only fetches it on the search page, where
+    matching sections are listed above the regular search results. Browsers
+    which cannot decompress it fetch the uncompressed copy,
+    ``_static/wikisearch.json``, instead.
+
+.. wikisection:: faq
+  :title: Section within Sections
+
+  Title elements are not allowed in docstring by docutils or sphinx.
+  Other extensions that require this functionality, e.g. numpy, implement
+  their own preprocessing methods (cf. ``source-read`` event by sphinx).
+  The possible ways nested sections can be achieved by ``sphinxcontrib-wiki``
+  are:
+
+  - Separate out the subsection into a ``wikisection`` of its own and assign
+    its parent to the parent ``wikisection``, for instance:
+
+    .. code-block:: rst
+
+          .. wikisection:: example
+              :title: Parent Section
+
+              Body of parent.
+
+          .. wikisection:: example
+              :title: Child Section
+              :parent: Parent Section
+
+              Body of child.
+  - Use the ``rubric`` directive which allows adding a title within a
+    directive body but whose information is lost to the table of contents.
+
+.. wikisection:: faq
+  :title: Section Reuse
+
+  It may be desirable to reuse the same section in different wiki pages. This
+  is currently not possible as it requires rethinking the ``parent`` option.
+  One possibility is to extend the syntax as follows:
+
+  .. code-block:: rst
+
+      .. wikisection:: first, second
+          :title: Section belonging to many pages
+          :parents: first[Parent in first page], second[_default_]
+
+  Another possibility is to invert the control and let pages decide their
+  hierarchy, requiring some preprocessing on raw sources:
+
+  .. code-block:: rst
+
+      .. wikipage:: example
+          :tree:
+              section1
+                  section1.1
+                  section1.2
+              section2
+
+.. wikisection:: todo
+    :title: Tree documentation
+
+    Document more clearly how the wiki page tree structure is determined by
+    default: it's all in the dots in rst document name, i.e ideally for python
+    packages and potentially confusing otherwise.
+
+.. wikisection:: todo
+    :title: Report
+
+    Sphinx API documentation for developing extensions is not friendly to
+    newcomers. Document the available sources (docutils, sphinx, and
+    extensions in sphinxcontrib) and the basics of creating an extension.
+"""
+
+import copy
+import fnmatch
+import functools
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import posixpath
+import re
+import uuid
+from collections import OrderedDict
+
+import sphinx
+from sphinx import addnodes
+from docutils import nodes, utils
+from docutils.frontend import OptionParser, Values
+from docutils.parsers import rst
+from docutils.parsers.rst import Directive
+from docutils.parsers.rst.states import RSTStateMachine, state_classes
+from docutils.statemachine import StringList
+from sphinx.environment.collectors.toctree import TocTreeCollector
+from sphinx.environment import NoUri
+from sphinx.util.docutils import LoggingReporter, sphinx_domains
+from sphinx.util.nodes import set_source_info
+from sphinx.util.parallel import ParallelTasks, parallel_available
+from docutils.parsers.rst import directives
+
+from .serialize import dump_nodes, flatten, load_nodes, unflatten
+from .tree import WikiTree
+
+
+def _load_section(flat, packed):
+    node = unflatten(flat)
+    node.__dict__['_packed'] = packed
+    return node
+
+
+class wikisection(nodes.section):
+
+    def __reduce_ex__(self, protocol):
+        # Sections stored in the build environment, i.e removed from their
+        # documents, are pickled compactly, cf. serialize.dump_nodes(), and
+        # their children only rebuilt when first needed.
+        if self.parent is not None:
+            return nodes.section.__reduce_ex__(self, protocol)
+        packed = self.__dict__.get('_packed') or dump_nodes(self.children)
+        return _load_section, (flatten(self.copy()), packed)
+
+    @property
+    def children(self):
+        if '_packed' in self.__dict__:
+            children = load_nodes(self.__dict__.pop('_packed'))
+            for child in children:
+                child.parent = self
+            self.__dict__['children'] = children
+        return self.__dict__['children']
+
+    @children.setter
+    def children(self, children):
+        self.__dict__.pop('_packed', None)
+        self.__dict__['children'] = children
+
+
+class wikipage(nodes.General, nodes.Element):
+    pass
+
+
+def _name_to_anchor(name):
+    return '-'.join(name.split()).lower()
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _section_digest(node):
+    """Returns a digest of the contents of a :class:`wikisection` node, i.e
+    of its title and body but not its options, cf. :func:`diff_snapshots`."""
+    text = u''.join(child.pformat() for child in node.children)
+    if 'deferred' in node:
+        text += u'\n'.join(node['deferred']['lines'])
+    return _digest(text)
+
+
+def _duplicate_title(options):
+    """Returns the first title that appears more than once among the given
+    section options (cf. :meth:`WikiSection.run`), or ``None``."""
+    titles = set()
+    for opts in options:
+        if opts['title'] in titles:
+            return opts['title']
+        titles.add(opts['title'])
+    return None
+
+
+def _parent_cycle(options):
+    """Returns the title of a section whose forced parents (cf.
+    :meth:`WikiSection.run`) lead back to itself, or ``None``."""
+    parents = {opts['title']: opts['parent'] for opts in options}
+    for title in sorted(parents):
+        seen = set()
+        while title in parents and title not in seen:
+            seen.add(title)
+            title = parents[title]
+        if title in seen:
+            return title
+    return None
+
+
+class WikiSection(Directive):
+    """
+    Handler for the ``wikisection`` directive. Each section has one reqiured
+    argument, the identifier of the wikipage to which it belongs, and one
+    required option ``title`` which is used by other sections to reference it.
+    Furthermore, each section must have a non-empty body.
+
+    By default, the placement of each section, and thus the depth of its title
+    heading, is automatically calculated based on the package hirerarchy.
+    Optionally, the parent of the section in the page tree, which is another
+    section, can be specified as an option, default is ``_default_``. Parent
+    resolution is performed as follows:
+
+    1. If parent is ``_default_``, the parent is the last observed section (as
+       per sphinx-dictated order of ``traverse``) whose depth is one less than
+       this section.
+    2. If parent is the title of another section, that section will be forced
+       to be the parent of this section.
+    3. If parent is ``_none_``, this section is placed in the top level of the
+       corresponding wiki page.
+
+    """
+
+    node_class = wikisection
+    has_content = True
+    required_arguments = 1
+    optional_arguments = 0
+    option_spec = {
+        'title': directives.unchanged,
+        'parent': directives.unchanged,
+    }
+
+    def run(self):
+        env = self.state.document.settings.env
+        if 'title' not in self.options or not self.options['title']:
+            env.app.warn('Ignoring wikipage section with no title in %s.' %
+                         env.docname)
+            return []
+
+        assert self.options['title'] not in ['_none_', '_default_']
+        sec = wikisection()
+        sec['options'] = {
+            'page_name': self.arguments[0],
+            'title': self.options['title'],
+            'parent': self.options.get('parent', '_default_'),
+        }
+        set_source_info(self, sec)
+
+        self.assert_has_content()
+
+        title_text = self.options['title']
+        sec += nodes.title(title_text, title_text)
+        if env.config['wiki_enabled'] and \
+                env.config['wiki_deferred_parse'] and \
+                not self._registers_targets():
+            # cf. parse_deferred()
+            sec['deferred'] = {
+                'lines': list(self.content.data),
+                'items': list(self.content.items),
+                'ref_context': dict(env.ref_context),
+            }
+        else:
+            self.state.nested_parse(self.content, self.content_offset, sec)
+
+        sec['ids'] = [_name_to_anchor(title_text)]
+        return [sec]
+
+    def _registers_targets(self):
+        # Whether the body contains hyperlink targets, or directives of a
+        # domain or of the index which register objects when the document is
+        # read; such bodies cannot be deferred, cf. parse_deferred().
+        for line in self.content:
+            if _TARGET_RE.match(line):
+                return True
+            match = _BODY_DIRECTIVE_RE.match(line)
+            if not match:
+                continue
+            name = match.group(1)
+            directive, messages = directives.directive(
+                name, self.state.memo.language, self.state.document)
+            module = getattr(directive, '__module__', None) or ''
+            if name == 'index' or module.startswith('sphinx.domains'):
+                return True
+        return False
+
+
+# Hyperlink targets and directives in section bodies, cf.
+# WikiSection._registers_targets().
+_TARGET_RE = re.compile(r'^\s*\.\.\s+_')
+_BODY_DIRECTIVE_RE = re.compile(r'^\s*\.\.\s+([\w:.+-]+)::')
+
+
+class WikiPage(Directive):
+    """
+    Handler for the ``wikipage`` directive. Each page has one required
+    argument, its identifier and a required option, its ``title``. Optionally,
+    a page can have a body which will be rendered above all its child sections.
+    The ``split`` option moves the sections of the page to separate documents,
+    cf. :func:`split_pages`; the ``part`` and ``autopage`` options are used
+    by the documents generated for them and for pages without a host, cf.
+    :func:`write_autopages`. Neither makes a document count as generated.
+    """
+
+    has_content = True
+    required_arguments = 1
+    optional_arguments = 0
+    option_spec = {
+        'title': directives.unchanged,
+        'split': directives.positive_int,
+        'part': directives.positive_int,
+        'autopage': directives.flag,
+    }
+
+    def run(self):
+        page_node = wikipage()
+        env = self.state.document.settings.env
+        if 'title' not in self.options or not self.options['title']:
+            title = '[' + self.arguments[0] + ']'
+            env.app.warn(env.docname,
+                         'Using name "%s" for wikipage with no title' % title)
+        else:
+            title = self.options['title']
+
+        page_node['options'] = {
+            'name': self.arguments[0],
+            'title': title,
+        }
+        for option in ['split', 'part']:
+            if option in self.options:
+                page_node['options'][option] = self.options[option]
+        if 'autopage' in self.options:
+            page_node['options']['autopage'] = True
+
+        # The wikipage directive can have its own content, parse it now. For
+        # the page sections belonging to it we have to wait until doctree-read
+        # for all page sections to be collected.
+        self.state.nested_parse(self.content, self.content_offset, page_node)
+
+        return [page_node]
+
+
+# Directives that may bring wiki sections or pages into a document, cf.
+# source_read(). Included files are not seen by source-read.
+_DIRECTIVE_RE = re.compile(r'^\s*\.\.\s+(wikisection|wikipage|include)::',
+                           re.MULTILINE)
+
+
+def _skip_doc(app, env, docname):
+    return app.config['wiki_prescan'] and hasattr(env, 'wikidocs') and \
+        docname not in env.wikidocs
+
+
+def source_read(app, docname, source):
+    """Handler for sphinx's ``source-read`` event. This is where we record
+    documents which may contain wiki sections or pages in the set
+    ``env.wikidocs``, such that :func:`doctree_read` and
+    :func:`doctree_resolved` can ignore all other documents right away. The
+    same goes for docstrings included by autodoc, cf.
+    :func:`autodoc_process_docstring`.
+
+    .. wikisection:: faq
+        :title: Documents without Wiki Directives
+        :parent: Resolving References
+
+        Documents are scanned for the ``wikisection``, ``wikipage`` and
+        ``include`` directives (and docstrings for the first two) before they
+        are parsed; all other documents are skipped when sections are collected
+        and pages are assembled. Content produced by other means, e.g. by
+        directives of another extension, is missed by this scan, in which case
+        it can be turned off with ``wiki_prescan = False``.
+    """
+    env = app.env
+    if not hasattr(env, 'wikidocs'):
+        env.wikidocs = set()
+    if _DIRECTIVE_RE.search(source[0]):
+        env.wikidocs.add(docname)
+
+
+def autodoc_process_docstring(app, what, name, obj, options, lines):
+    """Handler for autodoc's ``autodoc-process-docstring`` event, cf.
+    :func:`source_read`."""
+    env = app.env
+    if not hasattr(env, 'wikidocs'):
+        env.wikidocs = set()
+    if env.docname not in env.wikidocs and \
+            _DIRECTIVE_RE.search('\n'.join(lines)):
+        env.wikidocs.add(env.docname)
+
+
+def _matches(name, patterns):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def harvested(config, page_name, docname):
+    """Decides whether sections of a given page found in a given document are
+    collected at all, based on the glob patterns in ``wiki_pages_include``,
+    ``wiki_pages_exclude`` and ``wiki_docnames_include``. The include lists
+    default to ``None``, i.e everything is included.
+
+    :param config: The sphinx configuration object.
+    :param page_name: The name of the page a section belongs to.
+    :param docname: The document a section was found in, or ``None`` to only
+        decide on the page.
+
+    .. wikisection:: faq
+        :title: Targeted Builds
+        :parent: _none_
+
+        To only render some wiki pages, e.g for a quick preview, set
+        ``wiki_pages_include`` to glob patterns matching their names and/or
+        ``wiki_docnames_include`` to patterns matching the documents whose
+        sections should be collected, e.g ``['some_pkg.*']``. Sections that
+        are not collected are still removed from their original place and
+        pages that are excluded are left out of their host documents.
+    """
+    include = config['wiki_pages_include']
+    if include is not None and not _matches(page_name, include):
+        return False
+    if _matches(page_name, config['wiki_pages_exclude']):
+        return False
+    include = config['wiki_docnames_include']
+    return docname is None or include is None or _matches(docname, include)
+
+
+def doctree_read(app, doctree):
+    """Handler for sphinx's ``doctree-read`` event. This is where we remove all
+    ``wikisection`` nodes from the doctree and store them in the build
+    environment.
+
+    .. wikisection:: faq
+        :title: Resolving References
+        :parent: _none_
+
+        The current implementation stores all sections in the build
+        environment after ``doctree-read`` and uses them to populate all pages
+        upon ``doctree-resolved``. This is needed to allow all sections to be
+        collected before any page is assembled.
+    """
+    env = app.builder.env
+
+    if not hasattr(env, 'wikisections'):
+        env.wikisections = {}
+    if not hasattr(env, 'wikipages'):
+        env.wikipages = {}
+    if _skip_doc(app, env, env.docname):
+        return
+
+    # Remember which documents host which pages, e.g. to point search results
+    # to the right place.
+    for node in doctree.traverse(wikipage):
+        options = node['options']
+        if 'part' in options:
+            # A part of a split page, cf. split_pages(), not a host of its own.
+            continue
+        if not harvested(app.config, options['name'], None):
+            continue
+        hosts = env.wikipages.setdefault(options['name'], [])
+        if env.docname not in hosts:
+            hosts.append(env.docname)
+        if 'split' in options:
+            if not hasattr(env, 'wikisplits'):
+                env.wikisplits = {}
+            env.wikisplits.setdefault(env.docname, {})[options['name']] = {
+                'split': options['split'],
+                'title': options['title'],
+                'parts': [],
+            }
+
+    for node in doctree.traverse(wikisection):
+        page_name = node['options']['page_name']
+        if not app.config['wiki_enabled']:
+            env.wikisections.setdefault(page_name, [])
+            continue
+
+        if harvested(app.config, page_name, env.docname):
+            env.wikisections.setdefault(page_name, []).append({
+                'docname': env.docname,
+                'depth': env.docname.count('.') + 1,
+                # e.g "<path>:docstring of <name>" for autodoc, to which
+                # the line numbers of the section are relative
+                'source': node.source,
+                'line': node.line,
+                'node': _stored_node(node),
+                'digest': _section_digest(node),
+            })
+        # Remove the section from its original place.
+        node.parent.remove(node)
+
+    # At this point, a document containing wikisections has spurious entries
+    # in its ToC; rebuild it.
+    TocTreeCollector().process_doc(app, doctree)
+
+
+def doctree_resolved(app, doctree, docname):
+    """Handler for sphinx's ``doctree-resolved`` event. This is where we replace
+    all ``wikipage`` nodes based on the stored sections from the build
+    environment and resolve all references.
+    """
+    env = app.builder.env
+    # Builders assembling a single doctree from many documents, e.g the
+    # LaTeX builder, resolve it under the name of the first document.
+    if _skip_doc(app, env, docname) and \
+            not hasattr(app.builder, 'assemble_doctree'):
+        return
+
+    pages = []
+    unresolved = []
+    for node in doctree.traverse(wikipage):
+        page_name = node['options']['name']
+        if not harvested(app.config, page_name, None):
+            node.replace_self([])
+            continue
+        newnode = wikipage_tree(app, env, docname, page_node=node)
+        sections = getattr(env, 'wikisections', {}).get(page_name, [])
+        jobs = _parallel_jobs(app, len(sections))
+        if newnode and jobs > 1:
+            unresolved.extend(
+                resolve_page_xrefs(app, env, docname, newnode, jobs))
+        node.replace_self(newnode)
+        if newnode:
+            pages.append((page_name, newnode))
+    assign_anchors(env, docname, doctree, pages)
+
+    # At this point, a document containing pages has missing entries in its
+    # ToC; rebuild it.
+    # HACK for some reason the env object here doesn't have docname
+    env.temp_data['docname'] = docname
+    TocTreeCollector().process_doc(app, doctree)
+
+    unresolved.extend(resolve_pending_xrefs(app, env, docname, doctree))
+    if hasattr(env, 'wikiunresolved'):
+        env.wikiunresolved.pop(docname, None)
+        if unresolved:
+            env.wikiunresolved[docname] = unresolved
+
+    if hasattr(env, 'wikitargets'):
+        env.wikitargets[docname] = page_targets(app, env, docname, pages)
+    if app.config['wiki_stable_output'] and pages:
+        _remember_output(app, docname)
+
+    if app.config['wiki_lazy_sections'] and \
+            app.builder.name in _LAZY_BUILDERS:
+        mark_lazy_bodies(doctree)
+
+
+def page_targets(app, env, docname, pages):
+    """Lists the documents that the resolved references in the wiki pages
+    assembled in a document point to, cf. :func:`page_digests`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where the pages are hosted.
+    :param pages: A list of page name and page container pairs, cf.
+        :func:`assign_anchors`.
+
+    :rtype: :class:`list[str]`
+    """
+    targets = set()
+    for page_name, page_cont in pages:
+        for ref in page_cont.traverse(nodes.reference):
+            if 'refuri' in ref:
+                targets.add(_target_docname(app, env, docname, ref))
+    targets.discard(None)
+    targets.discard(docname)
+    return sorted(targets)
+
+
+# path of an output file => (mtime, digest) before it was written
+_outputs = {}
+
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _remember_output(app, docname):
+    # Called before a document is written, cf. restore_outputs().
+    if not hasattr(app.builder, 'get_outfilename'):
+        return
+    path = app.builder.get_outfilename(docname)
+    if os.path.exists(path):
+        _outputs[path] = (os.path.getmtime(path), _file_digest(path))
+
+
+def restore_outputs():
+    """Restores the modification time of the output files of documents
+    hosting wiki pages which were written with unchanged contents, such that
+    tools comparing modification times, e.g ``rsync``, consider them
+    untouched. Only output files of builders which name them, i.e the HTML
+    builders, are restored."""
+    for path, (mtime, digest) in sorted(_outputs.items()):
+        if os.path.exists(path) and _file_digest(path) == digest:
+            os.utime(path, (os.path.getatime(path), mtime))
+    _outputs.clear()
+
+
+# HTML builders whose pages may load section bodies lazily, cf.
+# mark_lazy_bodies(). Others, e.g. epub, cannot fetch them.
+_LAZY_BUILDERS = ('html', 'dirhtml', 'singlehtml')
+
+
+def mark_lazy_bodies(doctree):
+    """Marks the bodies of all wiki sections in a doctree, except for their
+    first paragraph and their subsections, to be moved out of the HTML page,
+    cf. :func:`write_lazy_bodies`. Each body is surrounded by numbered HTML
+    comments.
+
+    :param doctree: The resolved doctree of a document hosting wiki pages.
+
+    .. wikisection:: faq
+        :title: Lazy Section Bodies
+        :parent: Assembling Pages Once
+
+        With ``wiki_lazy_sections = True`` the HTML builders only put the
+        title and the first paragraph of each wiki section in the page. The
+        rest of the section body is written to a separate file in the
+        ``_wiki`` directory of the output and fetched when the reader clicks
+        "Show more", or opened on its own without javascript. Subsections are
+        kept in the page, each with a lazy body of its own. Note that browser
+        search within the page misses text that has not been fetched yet.
+    """
+    count = 0
+    for cont in doctree.traverse(nodes.section):
+        if 'wikipage-section' not in cont['classes']:
+            continue
+        start = 1
+        if len(cont) > start and isinstance(cont[start], nodes.paragraph) \
+                and 'section-source' not in cont[start]['classes']:
+            start += 1
+        end = start
+        while end < len(cont) and \
+                not isinstance(cont[end], nodes.section) and \
+                'section-source' not in cont[end].get('classes', []):
+            end += 1
+        if end == start:
+            continue
+        count += 1
+        cont.insert(end, nodes.raw('', '<!--/wiki-lazy:%d-->' % count,
+                                   format='html'))
+        cont.insert(start, nodes.raw('', '<!--wiki-lazy:%d-->' % count,
+                                     format='html'))
+
+
+def resolve_pending_xrefs(app, env, docname, doctree):
+    """Resolves all ``pending_xref`` nodes within a node of a document
+    hosting wiki pages, cf. :func:`resolve_xref`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where the wiki pages are hosted.
+    :param doctree: The node containing the references, e.g the whole
+        doctree of the document.
+
+    :returns: The references that could not be resolved.
+    :rtype: :class:`list[dict]`
+    """
+    # Now all pending_xref nodes can be properly resolved. They are resolved
+    # in batches, one per domain and role.
+    # NOTE cf. sphinx.environment.resolve_references().
+    batches = OrderedDict()
+    seen = set()
+    for node in doctree.traverse(addnodes.pending_xref):
+        # if a wikipage is included in two places, the doctree traversal sees
+        # the very same pending_xref nodes twice.
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if 'refdomain' in node and node['refdomain'] in env.domains:
+            key = (node['refdomain'], node['reftype'])
+            batches.setdefault(key, []).append(node)
+        else:
+            node.replace_self(node[0].deepcopy())
+
+    unresolved = []
+    for (domain_name, reftype), batch in batches.items():
+        narrow = None
+        if domain_name == 'py':
+            domain = env.domains[domain_name]
+            narrow = functools.partial(_narrow_python_xref, env, domain,
+                                       domain.objtypes_for_role(reftype))
+        for node in batch:
+            contnode = node[0].deepcopy()
+            newnode = resolve_xref(app, env, docname, node, contnode,
+                                   narrow)
+            if newnode is None:
+                unresolved.append(_unresolved_entry(docname, node))
+                if app.config['wiki_keep_unresolved_text']:
+                    newnode = contnode
+            node.replace_self(newnode or [])
+    return unresolved
+
+
+def resolve_page_xrefs(app, env, docname, page_cont, jobs):
+    """Resolves the references in the top level sections of an assembled wiki
+    page in a pool of forked processes, cf. :func:`resolve_pending_xrefs`.
+    The sections are split into consecutive runs with a similar number of
+    references, one per process, and replaced in order by their resolved
+    counterparts. References cached by the processes are merged into
+    ``env.wikixrefs``, cf. :func:`resolve_xref`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where the page is hosted.
+    :param page_cont: The page container, cf. :func:`wikipage_container`.
+    :param jobs: The number of processes.
+
+    :returns: The references that could not be resolved.
+    :rtype: :class:`list[dict]`
+    """
+    indices = [idx for idx, child in enumerate(page_cont.children)
+               if isinstance(child, nodes.section)]
+    cache = getattr(env, 'wikixrefs', None)
+
+    def resolve(chunk):
+        cached = set(cache or ())
+        unresolved, subtrees = [], []
+        for idx in chunk:
+            unresolved.extend(
+                resolve_pending_xrefs(app, env, docname, page_cont[idx]))
+            subtrees.append(_detach(page_cont[idx]))
+        added = {key: cache[key] for key in set(cache or ()) - cached}
+        return subtrees, unresolved, added
+
+    sizes = [len(page_cont[idx].traverse(addnodes.pending_xref))
+             for idx in indices]
+    chunks = [[indices[pos] for pos in run]
+              for run in _partition(sizes, jobs)]
+    unresolved = []
+    for chunk, (subtrees, chunk_unresolved, added) in \
+            zip(chunks, _parallel_map(jobs, resolve, chunks)):
+        for idx, subtree in zip(chunk, subtrees):
+            page_cont[idx] = subtree
+        unresolved.extend(chunk_unresolved)
+        if cache is not None:
+            cache.update(added)
+    return unresolved
+
+
+def _unresolved_entry(docname, node):
+    section = node.parent
+    while section is not None and \
+            'wikipage-section' not in section.get('classes', []):
+        section = section.parent
+    return {
+        'docname': docname,
+        'source': node.get('refdoc'),
+        'section': section[0].astext() if section is not None else None,
+        'domain': node['refdomain'],
+        'reftype': node['reftype'],
+        'target': node['reftarget'],
+    }
+
+
+def _python_suffixes(env, domain):
+    # dotted suffix of object name (str) => full object names (list), built
+    # when first needed and kept until documents are read again, cf.
+    # env_updated()
+    if getattr(env, 'wikisuffixes', None) is None:
+        env.wikisuffixes = {}
+        for fullname in domain.data['objects']:
+            parts = fullname.split('.')
+            for idx in range(1, len(parts)):
+                env.wikisuffixes.setdefault('.'.join(parts[idx:]),
+                                            []).append(fullname)
+    return env.wikisuffixes
+
+
+def _narrow_python_xref(env, domain, objtypes, node):
+    """The Python domain resolves "refspecific" references (e.g.
+    ``:func:`.name```) which do not match exactly by scanning all of its
+    objects, once per reference. Instead, given the object types allowed for
+    the role (computed once per batch), this looks such references up in a
+    table of all dotted suffixes of object names, built on the first of them
+    and kept for the whole build, cf. ``env.wikisuffixes``. It returns a copy
+    of the node pointing to the unique match, ``None`` if there is no match,
+    or the node itself if the domain should decide. Cf.
+    :meth:`sphinx.domains.python.PythonDomain.find_obj`.
+    """
+    name = node['reftarget']
+    if name[-2:] == '()':
+        name = name[:-2]
+    if not node.hasattr('refspecific') or not name or objtypes is None:
+        return node
+
+    objects = domain.data['objects']
+    modname, clsname = node.get('py:module'), node.get('py:class')
+    exact = [name]
+    if modname:
+        exact.append(modname + '.' + name)
+        if clsname:
+            exact.append(modname + '.' + clsname + '.' + name)
+    if any(fullname in objects and objects[fullname][1] in objtypes
+           for fullname in exact):
+        return node
+
+    matches = [fullname for fullname
+               in _python_suffixes(env, domain).get(name, [])
+               if objects[fullname][1] in objtypes]
+    if not matches:
+        return None
+    if len(matches) > 1:
+        # let the domain warn about the ambiguity
+        return node
+    narrowed = node.copy()
+    del narrowed['refspecific']
+    narrowed['reftarget'] = matches[0]
+    return narrowed
+
+
+def _xref_cache_key(app, docname, node):
+    domain = node['refdomain']
+    # Domains resolve targets relative to the context in which the reference
+    # appeared, e.g. the current module and class for the Python domain.
+    context = tuple(sorted((key, value)
+                           for key, value in node.attributes.items()
+                           if key.startswith(domain + ':')))
+    key = (domain, node['reftype'], node['reftarget'], docname,
+           app.builder.name, node.hasattr('refspecific'), context)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _drop_xrefs(env, docnames, names):
+    # Drops the cached references pointing to any of the given documents or
+    # to any of the given object names, including references to a dotted
+    # suffix of a name, which may resolve to other targets now. Returns the
+    # documents hosting the dropped references.
+    suffixes = set()
+    for name in names:
+        parts = name.split('.')
+        suffixes.update('.'.join(parts[idx:]) for idx in range(len(parts)))
+    hosts = set()
+    for key, ref in list(env.wikixrefs.items()):
+        target = key[2]
+        if target[-2:] == '()':
+            target = target[:-2]
+        if ref['todocname'] in docnames or target in suffixes:
+            del env.wikixrefs[key]
+            hosts.add(key[3])
+    return hosts
+
+
+def record_definitions(env, docnames):
+    """Records the names of the objects defined by each of the given
+    documents, which were just read, in ``env.wikidefs`` and drops the cached
+    references to these names, cf. :func:`resolve_xref`: a new definition may
+    compete with the cached target of a reference, e.g a function with the
+    same name in the module the reference appears in.
+
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docnames: The names of the documents.
+
+    :returns: The documents hosting the dropped references.
+    :rtype: :class:`set[str]`
+    """
+    if not hasattr(env, 'wikidefs'):
+        env.wikidefs = {}
+    defined = {}
+    for domain in env.domains.values():
+        for name, _, _, docname, _, _ in domain.get_objects():
+            if docname in docnames:
+                defined.setdefault(docname, set()).add(name)
+    env.wikidefs.update(defined)
+    if not defined or not getattr(env, 'wikixrefs', None):
+        return set()
+    return _drop_xrefs(env, (), set.union(*defined.values()))
+
+
+def _target_docname(app, env, docname, refnode):
+    # The document a resolved reference in a host document points to. Target
+    # URIs of all documents are listed once per build, cf. env_updated(), and
+    # relative references are looked up relative to the URI of the host.
+    if 'refid' in refnode:
+        return docname
+    if getattr(env, 'wikiuris', None) is None:
+        env.wikiuris = {}
+        for other in env.all_docs:
+            try:
+                uri = app.builder.get_target_uri(other)
+            except NoUri:
+                continue
+            env.wikiuris[posixpath.normpath(uri)] = other
+    refuri = refnode.get('refuri', '').split('#')[0]
+    if not refuri:
+        return docname
+    try:
+        base = app.builder.get_target_uri(docname)
+    except NoUri:
+        return None
+    uri = posixpath.join(posixpath.dirname(base), refuri)
+    return env.wikiuris.get(posixpath.normpath(uri))
+
+
+def resolve_xref(app, env, docname, node, contnode, narrow=None):
+    """Resolves a single ``pending_xref`` node found in a wiki section as if it
+    belonged to the document hosting the wiki page.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where the wiki page is hosted.
+    :param node: The ``pending_xref`` node.
+    :param contnode: The contents of the reference, i.e its link text.
+    :param narrow: An optional callable which, given the node, returns the
+        node the domain should resolve instead or ``None`` if it cannot be
+        resolved, cf. :func:`_narrow_python_xref`.
+
+    :returns: The resolved node, or ``None``.
+
+    .. wikisection:: faq
+        :title: Caching References
+        :parent: Resolving References
+
+        With ``wiki_xref_cache = True`` references resolved by a domain are
+        remembered across builds, keyed by the domain, role, target, context,
+        hosting document and builder. An entry is dropped as soon as the
+        document defining its target is re-read, or any document defining an
+        object of the same name is read, which may compete with the cached
+        target. Since sphinx pickles the build environment before writing
+        output, the cache is saved separately in ``wikistate.pickle`` in the
+        doctree directory. Only plain links are cached, other results are
+        resolved by the domain every time.
+
+    .. wikisection:: faq
+        :title: Unresolved References
+        :parent: Resolving References
+
+        References in wiki sections which cannot be resolved are dropped
+        together with their text, or kept as plain text with
+        ``wiki_keep_unresolved_text = True``. Either way, setting
+        ``wiki_unresolved_report`` to a file name collects all of them, for
+        all pages, in a single JSON report in the output directory and issues
+        one warning instead of leaving them to be discovered page by page.
+    """
+    domain = env.domains[node['refdomain']]
+    cache = None
+    if app.config['wiki_xref_cache'] and hasattr(env, 'wikixrefs'):
+        cache = env.wikixrefs
+        key = _xref_cache_key(app, docname, node)
+        if key is None:
+            cache = None
+        elif key in cache:
+            attributes = copy.deepcopy(cache[key]['attributes'])
+            newnode = nodes.reference('', '', **attributes)
+            newnode += contnode
+            return newnode
+
+    target_node = node if narrow is None else narrow(node)
+    if target_node is None:
+        return None
+
+    # We don't care where the node is actually coming from, i.e
+    # its attributes['refdoc']. It now belongs to this document,
+    # resolve links as if it belongs to us.
+    newnode = domain.resolve_xref(env, docname, app.builder,
+                                  target_node['reftype'],
+                                  target_node['reftarget'],
+                                  target_node, contnode)
+
+    if cache is not None and isinstance(newnode, nodes.reference) and \
+            len(newnode) == 1 and newnode[0] is contnode:
+        todocname = _target_docname(app, env, docname, newnode)
+        if todocname is not None:
+            cache[key] = {
+                'todocname': todocname,
+                'attributes': copy.deepcopy(newnode.attributes),
+            }
+    return newnode
+
+
+def assign_anchors(env, docname, doctree, pages):
+    """Assigns unique anchors (i.e ``ids``) to the containers of assembled wiki
+    pages and their sections in a document, which may be hosting the same page
+    more than once and whose own targets may look like section anchors.
+
+    The anchors assigned to each document are remembered in
+    ``env.wikianchors``, keyed by page name, occurrence of the page in the
+    document, and section title (``None`` for the page itself). Anchors of the
+    previous build are kept as long as they remain unique, such that
+    permalinks survive unrelated changes. New anchors are derived from titles,
+    suffixed by a counter upon collision.
+
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where the pages are hosted.
+    :param doctree: The doctree of the hosting document.
+    :param pages: A list of page name and page container pairs, in document
+        order, cf. :func:`wikipage_container`.
+    """
+    if not hasattr(env, 'wikianchors'):
+        return
+    entries = []
+    occurrences = {}
+    for page_name, page_cont in pages:
+        occurrence = occurrences.get(page_name, 0)
+        occurrences[page_name] = occurrence + 1
+        entries.append(((page_name, occurrence, None), page_cont))
+        for cont in page_cont.traverse(nodes.section):
+            if 'wikipage-section' in cont['classes']:
+                key = (page_name, occurrence, cont[0].astext())
+                entries.append((key, cont))
+
+    previous = env.wikianchors.get(docname, {})
+    used = set(doctree.ids)
+    anchors = {}
+    for key, cont in entries:
+        anchor = previous.get(key)
+        if anchor is not None and anchor not in used:
+            anchors[key] = anchor
+            used.add(anchor)
+
+    # anchor derived from title (str) => last used suffix (int)
+    suffixes = {}
+    for key, cont in entries:
+        if key not in anchors:
+            base = cont['ids'][0]
+            anchor, suffix = base, suffixes.get(base, 1)
+            while anchor in used:
+                suffix += 1
+                anchor = '%s-%d' % (base, suffix)
+            suffixes[base] = suffix
+            anchors[key] = anchor
+            used.add(anchor)
+        cont['ids'] = [anchors[key]]
+        doctree.ids[anchors[key]] = cont
+    env.wikianchors[docname] = anchors
+
+
+# docutils default settings for the rst parser (dict), cf. parse_deferred()
+_rst_defaults = None
+
+
+def parse_deferred(app, env, sec_info):
+    """Parses the body of a stored section whose parsing was deferred, i.e
+    which was read with ``wiki_deferred_parse = True``, and appends the result
+    to its node. The body is parsed as if it were still in its original
+    document, cf. :meth:`WikiSection.run`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param sec_info: A dictionary containing stored info about one section,
+        cf. :func:`doctree_read()`.
+
+    .. wikisection:: faq
+        :title: Deferred Parsing
+        :parent: Resolving References
+
+        With ``wiki_deferred_parse = True`` section bodies are not parsed when
+        their document is read. Instead, their raw lines are stored and only
+        parsed when a page containing them is assembled; sections of pages
+        that are never hosted, or that are dropped, are never parsed. Since
+        the body is then parsed on its own, document-wide constructs such as
+        substitutions, footnotes and hyperlink targets defined elsewhere in
+        the original document are not available to it.
+
+        Bodies that define something other documents refer to, i.e
+        hyperlink targets, index entries or objects of a domain (e.g
+        ``.. py:function::``), are always parsed when their document is read:
+        by the time a deferred body is parsed, all references are resolved
+        and the index is built. Directives inside such definitions, or
+        brought in by other directives, are not detected; the ``:index:``
+        role is not either.
+    """
+    global _rst_defaults
+    sec_node = sec_info['node']
+    deferred = sec_node['deferred']
+    if _rst_defaults is None:
+        parser = OptionParser(components=(rst.Parser,))
+        _rst_defaults = parser.get_default_values().__dict__
+    settings = Values(_rst_defaults)
+    for key, value in env.settings.items():
+        setattr(settings, key, value)
+
+    source = sec_info.get('source') or env.doc2path(sec_info['docname'])
+    document = utils.new_document(source, settings)
+    document.reporter = LoggingReporter(
+        source, settings.report_level, settings.halt_level,
+        settings.debug, settings.error_encoding_error_handler)
+    content = StringList(deferred['lines'], items=deferred['items'])
+
+    # Roles and directives rely on the current document and context.
+    temp_data, ref_context = env.temp_data, env.ref_context
+    env.temp_data = {
+        'docname': sec_info['docname'],
+        'default_domain': env.domains.get(env.config.primary_domain),
+    }
+    env.ref_context = dict(deferred['ref_context'])
+    try:
+        with sphinx_domains(env):
+            RSTStateMachine(state_classes, 'Body').run(content, document,
+                                                       match_titles=False)
+    finally:
+        env.temp_data, env.ref_context = temp_data, ref_context
+
+    sec_node += document.children
+    _detach(sec_node)
+    del sec_node['deferred']
+
+
+def _section_text(app, sec_info):
+    sec_node = section_node(app, sec_info)
+    if 'deferred' in sec_node:
+        return sec_node[0].astext() + '\n' + \
+            '\n'.join(sec_node['deferred']['lines'])
+    return sec_node.astext()
+
+
+def _store_path(app, env):
+    return os.path.join(app.doctreedir, env.wikistore[0])
+
+
+def _store_matches(app, env):
+    # Whether the section store of the build environment is the one written
+    # along with it, cf. store_sections().
+    if not hasattr(env, 'wikistore'):
+        return False
+    try:
+        return os.path.getsize(_store_path(app, env)) == env.wikistore[1]
+    except OSError:
+        return False
+
+
+def _close_store(path):
+    if path in _stores:
+        _stores.pop(path)[1].close()
+
+
+# os.replace() overwrites existing files on all platforms; python 2 has none.
+_replace = getattr(os, 'replace', os.rename)
+
+
+# path of the section store => (stat of the file, memory map of the file)
+_stores = {}
+
+
+def _open_store(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_ino, stat.st_size, stat.st_mtime)
+    if path not in _stores or _stores[path][0] != key:
+        if not stat.st_size:
+            return None
+        with open(path, 'rb') as f:
+            _stores[path] = (key, mmap.mmap(f.fileno(), 0,
+                                            access=mmap.ACCESS_READ))
+    return _stores[path][1]
+
+
+def store_sections(app, env):
+    """Moves the nodes of all stored sections (cf. :func:`doctree_read`) to a
+    single file in the doctree directory, leaving only their options and ids
+    in the build environment. The file is memory mapped when sections are
+    needed, cf. :func:`section_node`. Sections whose parsing is deferred (cf.
+    :func:`parse_deferred`) are left as they are.
+
+    Each version of the file has a name of its own, which is recorded in the
+    build environment as ``env.wikistore`` along with its size, such that a
+    pickled build environment never refers to a store written later, e.g by
+    a failed build. The file is only written if sections were added, and
+    older versions are removed. Documents whose sections cannot be found in
+    the store are read again, cf. :func:`env_get_outdated`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    .. wikisection:: faq
+        :title: Section Store
+        :parent: _none_
+
+        With ``wiki_section_store = True`` section bodies are kept in a memory
+        mapped file instead of the build environment, such that they are only
+        loaded while their pages are assembled. This keeps the pickled build
+        environment small, and the memory of all sphinx processes flat: the
+        operating system shares the pages of the file between processes
+        reading it instead of each process holding its own copy.
+    """
+    matches = _store_matches(app, env)
+    if matches and all('stored' in sec_info or 'deferred' in sec_info['node']
+                       for sections in env.wikisections.values()
+                       for sec_info in sections):
+        return
+    old = _open_store(_store_path(app, env)) if matches else None
+
+    name = 'wikisections-%s.store' % uuid.uuid4().hex
+    path = os.path.join(app.doctreedir, name)
+    with open(path + '.tmp', 'wb') as f:
+        for page_name in sorted(env.wikisections):
+            for sec_info in env.wikisections[page_name]:
+                if 'stored' in sec_info:
+                    offset, length = sec_info['stored']
+                    data = old[offset:offset + length]
+                elif 'deferred' in sec_info['node']:
+                    continue
+                else:
+                    data = pickle.dumps(sec_info['node'],
+                                        pickle.HIGHEST_PROTOCOL)
+                    sec_info['node'] = sec_info['node'].copy()
+                sec_info['stored'] = (f.tell(), len(data))
+                f.write(data)
+        size = f.tell()
+    _replace(path + '.tmp', path)
+    env.wikistore = (name, size)
+
+    for filename in os.listdir(app.doctreedir):
+        if filename.startswith('wikisections') and \
+                filename.endswith('.store') and filename != name:
+            _close_store(os.path.join(app.doctreedir, filename))
+            os.remove(os.path.join(app.doctreedir, filename))
+
+
+def env_get_outdated(app, env, added, changed, removed):
+    """Handler for sphinx's ``env-get-outdated`` event. This is where
+    documents whose sections were moved to a section store which does not
+    match the build environment, e.g because it was removed, are read again,
+    cf. :func:`store_sections`.
+
+    :returns: The documents to read again.
+    :rtype: :class:`list[str]`
+    """
+    # Some versions of sphinx pass the builder instead of the environment.
+    env = app.builder.env
+    docnames = set(sec_info['docname']
+                   for sections in getattr(env, 'wikisections', {}).values()
+                   for sec_info in sections if 'stored' in sec_info)
+    if not docnames or _store_matches(app, env):
+        return []
+    return sorted(docnames - set(removed))
+
+
+def section_node(app, sec_info):
+    """Returns the ``wikisection`` node of a stored section, loading it from
+    the section store if needed, cf. :func:`store_sections`. A loaded node is
+    not kept in the build environment.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param sec_info: A dictionary containing stored info about one section,
+        cf. :func:`doctree_read()`.
+
+    :rtype: :class:`wikisection`
+    """
+    if 'stored' not in sec_info:
+        return sec_info['node']
+    offset, length = sec_info['stored']
+    store = _open_store(_store_path(app, app.builder.env))
+    return pickle.loads(store[offset:offset + length])
+
+
+def wikisection_container(app, env, sec_info):
+    """Builds a sphinx section corresponding to a given ``wikisection``.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param sec_info: A dictionary containing stored info about one section,
+        cf. :func:`doctree_read()`.
+
+    :returns: The sphinx section containing the given wiki section.
+    :rtype: :class:`sphinx.util.compat.nodes.section`
+    """
+    sec_node, docname = section_node(app, sec_info), sec_info['docname']
+    if 'deferred' in sec_node:
+        parse_deferred(app, env, sec_info)
+
+    # Create source citation "[source: :mod:`module.name`]".
+    src = nodes.subscript()
+
+    docref = nodes.reference('', '', internal=True)
+    docref_inner = nodes.literal(docname, docname,
+                                 classes=['xref', 'py', 'py-mod'])
+    try:
+        docref['refuri'] = app.builder.get_target_uri(docname)
+    except NoUri:
+        # Don't crash in LaTeX output
+        pass
+    docref += docref_inner
+    if docname not in env.all_docs:
+        # Harvested sections need not come from a document, cf.
+        # harvest_sections().
+        docref = docref_inner
+
+    parts = ['[' + sphinx.locale._('source') + ': ', ']']
+    src += [
+        nodes.inline(parts[0], parts[0]),
+        docref,
+        nodes.inline(parts[1], parts[1]),
+    ]
+
+    src_cont = nodes.paragraph(classes=['section-source'])
+    src_cont += src
+
+    # Point warnings about the contents, e.g unresolved references, to the
+    # original source, cf. _stored_node().
+    source = sec_info.get('source') or env.doc2path(docname)
+    for child in sec_node.traverse():
+        if child.source is None:
+            child.source = source
+
+    cont = nodes.section(classes=['wikipage-section'])
+    cont += sec_node.children               # section contents
+    cont.append(src_cont)                   # source citation
+    cont['ids'] = list(sec_node['ids'])     # permalink
+
+    return cont
+
+
+def wikipage_container(env, sec_tree, page_node):
+    """Builds a sphinx section corresponding to a ``wikipage`` provided the
+    ``wikisection`` tree for it is given.
+
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param sec_tree: A list of sphinx sections at the top level of the tree.
+    :param page_node: The :class:`wikipage` node as observed in some document.
+
+    :returns: A sphinx section containing the wiki page.
+    :rtype: :class:`sphinx.util.compat.nodes.section`
+    """
+    # NOTE If we wrap our wikisection section in a separate container,
+    # env.build_toc_from() breaks: it only parses the section tree as long
+    # as they are nested directly under each other (e.g. section -> wrapper ->
+    # section does not work).
+    cont = nodes.section(classes=['wikipage'])
+    title = page_node['options']['title']
+    cont += nodes.title(title, title)
+    # wiki pages may have contents of their own:
+    cont += page_node.children
+    cont += sec_tree
+    cont['ids'] = [_name_to_anchor(page_node['options']['name'])]
+    return cont
+
+
+def wikipage_tree(app, env, docname, page_node=None):
+    """Builds a section tree for a given ``wikipage`` node by collecting all
+    wikisections from the environment and placing them in the right place. The
+    placed sections are reused for all hosts of the page, cf.
+    :func:`section_tree`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where this :class:`wikipage` was found.
+    :param page_node: The :class:`wikipage` node as observed in some document.
+
+    :returns: A list of top level sections.
+    :rtype: :class:`list[sphinx.util.compat.nodes.section]`
+
+    .. wikisection:: faq
+        :title: Arbitrary Order of Processing
+        :parent: _none_
+
+        As long as the order in which sections are encountered is consistent
+        with a DFS of the module hierarchy, i.e up to reorderings of siblings
+        but not violating depth order, there are no problems. The DFS order is
+        what sphinx follows and the only possible chance of variation is in
+        sibling order caused by ``autodoc_member_order`` (and our output
+        respects this sibling order by default). But if for some reason, this
+        assumption is violated, i.e a section appearing deeper in the module
+        hierarchy is encountered before another section appearing shallower in
+        the module hierarchy, our logic for placing sections in the right place
+        breaks.
+
+    .. wikisection:: faq
+        :title: Cycles in parent relationships
+        :parent: _none_
+
+        If there are any cycles in the parent relationships the entire set of
+        sections within that cycle are swallowed by docutils. Since docutils
+        raises no error, this extension warns about one section in each page
+        with such a cycle, as does ``sphinx-wiki-lint``.
+    """
+    assert isinstance(page_node, wikipage)
+    page_name = page_node['options']['name']
+    if not hasattr(env, 'wikitrees'):
+        env.wikitrees = {}
+    if page_name not in env.wikitrees:
+        env.wikitrees[page_name] = section_tree(app, env, docname, page_name)
+    sec_tree = env.wikitrees[page_name]
+    if sec_tree is None:
+        return []
+
+    options = page_node['options']
+    if 'part' in options:
+        part = getattr(env, 'wikiparts', {}).get(docname)
+        if part is None or part['page'] != page_name:
+            app.warn('Ignoring part of wikipage "%s" which is not split' %
+                     page_name, docname)
+            return []
+        sec_tree = [cont for cont in sec_tree
+                    if cont[0].astext() in part['roots']]
+    elif 'split' in options and app.builder.format == 'html':
+        split = getattr(env, 'wikisplits', {}).get(docname, {})
+        parts = split.get(page_name, {}).get('parts', [])
+        index = wikipage_index(app, env, docname, parts)
+        return wikipage_container(env, [index], page_node)
+
+    # The assembled tree is shared by all hosts of the page; each of them
+    # resolves references and assigns anchors in a copy of its own.
+    sec_tree = [cont.deepcopy() for cont in sec_tree]
+    cont = wikipage_container(env, sec_tree, page_node)
+    return cont
+
+
+def section_tree(app, env, docname, page_name):
+    """Sorts, checks and places the sections of a wiki page, independently of
+    the documents hosting it, cf. :func:`wikipage_tree`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name warnings refer to.
+    :param page_name: The name of the page.
+
+    :returns: A list of top level sections, or ``None`` if the page is
+        ignored.
+    :rtype: :class:`list[sphinx.util.compat.nodes.section]`
+
+    .. wikisection:: faq
+        :title: Very Large Pages
+        :parent: Assembling Pages Once
+
+        With ``wiki_parallel_jobs`` set to more than one process, the top
+        level sections of pages with at least ``wiki_parallel_threshold``
+        sections are split into as many runs of consecutive subtrees, which
+        are assembled, and later on have their references resolved, in
+        separate forked processes. As with sphinx's own parallel builds,
+        processes are only forked on POSIX systems.
+
+        Each run comes back pickled, and unpickling it in the main process
+        costs about as much as assembling it there. ``python -m
+        tests.parallel.benchmark`` times both paths: on one core and a page of
+        500 sections, assembling took 0.55s serially but 2.37s with two
+        processes, and 2.00s against 4.14s with ``wiki_deferred_parse``, so
+        forking is left off by default and only worth trying where the
+        benchmark shows it faster.
+    """
+    try:
+        sections = env.wikisections[page_name]
+        sections = sorted(sections,
+                          key=lambda s: s['node']['options']['title'])
+    except KeyError:
+        app.warn('Ignoring wikipage "%s" with no page sections.' % page_name)
+        return None
+
+    # Make sure there are no duplicate wikisection titles:
+    options = [info['node']['options'] for info in sections]
+    title = _duplicate_title(options)
+    if title is not None:
+        app.warn(docname,
+                 'Ignoring wikipage containing sections with ' +
+                 'duplicate titles "%s"' % title)
+        return None
+    title = _parent_cycle(options)
+    if title is not None:
+        app.warn('wikisection "%s" is part of a cycle of parents' % title,
+                 docname)
+
+    tree = _wiki_tree(sections)
+    for idx in tree.unknown_parents:
+        # Unresolved reference; treated as if it didn't have :parent:
+        app.warn('wikisection "%s" references unknown parent "%s"' %
+                 (options[idx]['title'], options[idx]['parent']))
+
+    jobs = _parallel_jobs(app, len(sections))
+    if jobs < 2 or len(tree.roots) < 2:
+        return place_sections(app, env, sections, tree, tree.roots)
+
+    def place(roots):
+        return [_detach(cont)
+                for cont in place_sections(app, env, sections, tree, roots)]
+
+    sizes = [len(_subtree(tree, [idx])) for idx in tree.roots]
+    chunks = [[tree.roots[pos] for pos in run]
+              for run in _partition(sizes, jobs)]
+    return [cont for result in _parallel_map(jobs, place, chunks)
+            for cont in result]
+
+
+def _wiki_tree(sections):
+    # the WikiTree of the given sorted sections of a page
+    return WikiTree([{
+        'title': info['node']['options']['title'],
+        'parent': info['node']['options']['parent'],
+        'depth': info['depth'],
+    } for info in sections])
+
+
+def _subtree(tree, roots):
+    # indices of all sections under the given roots, cf. WikiTree
+    indices, stack = [], list(roots)
+    while stack:
+        idx = stack.pop()
+        indices.append(idx)
+        stack.extend(tree.children[idx])
+    return indices
+
+
+def place_sections(app, env, sections, tree, roots):
+    """Builds the containers of the sections in the given subtrees of a wiki
+    page and places them under each other, cf. :func:`section_tree`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param sections: The sorted sections of the page, cf.
+        :func:`doctree_read`.
+    :param tree: The :class:`~sphinxcontrib.wiki.tree.WikiTree` of the
+        sections.
+    :param roots: The indices of the top level sections to place.
+
+    :returns: The containers of the given top level sections.
+    :rtype: :class:`list[sphinx.util.compat.nodes.section]`
+    """
+    indices = _subtree(tree, roots)
+    containers = {idx: wikisection_container(app, env, sections[idx])
+                  for idx in sorted(indices)}
+    for idx in indices:
+        for child in tree.children[idx]:
+            containers[idx].append(containers[child])
+    return [containers[idx] for idx in roots]
+
+
+def _parallel_jobs(app, count):
+    # number of processes to assemble a page of the given number of sections
+    jobs = app.config['wiki_parallel_jobs']
+    if not parallel_available or jobs < 2 or \
+            count < app.config['wiki_parallel_threshold']:
+        return 1
+    return jobs
+
+
+def _partition(sizes, jobs):
+    """Splits the indices of the given sizes into at most ``jobs`` runs of
+    consecutive indices with similar total sizes."""
+    runs, run, total = [], [], 0
+    target = float(sum(sizes)) / jobs
+    for idx, size in enumerate(sizes):
+        run.append(idx)
+        total += size
+        if len(runs) < jobs - 1 and total >= target * (len(runs) + 1):
+            runs.append(run)
+            run = []
+    if run:
+        runs.append(run)
+    return runs
+
+
+def _detach(node):
+    # Nodes parsed from a document point back to it and, through its
+    # settings, to the build environment; neither is to be pickled with them.
+    for child in node.traverse():
+        child.document = None
+    return node
+
+
+def _stored_node(node):
+    # A copy of a wikisection to keep in the build environment, detached from
+    # its document. The source of the section is left out of every node,
+    # stored once alongside it by doctree_read() and restored when the section
+    # is assembled, cf. wikisection_container().
+    node = _detach(node.deepcopy())
+    for child in node.traverse():
+        child.source = None
+    return node
+
+
+def _parallel_map(jobs, func, chunks):
+    """Calls a function on each of the given chunks in forked processes, cf.
+    :class:`sphinx.util.parallel.ParallelTasks`, and returns the results in
+    order. Results are pickled on their way back to this process."""
+    results = [None] * len(chunks)
+
+    def collect(idx, result):
+        results[idx] = result
+
+    tasks = ParallelTasks(jobs)
+    for idx in range(len(chunks)):
+        tasks.add_task(lambda idx: func(chunks[idx]), idx, collect)
+    tasks.join()
+    return results
+
+
+def wikipage_index(app, env, docname, parts):
+    """Builds the list of links to the top level sections of a split wiki
+    page which replaces the sections in the document hosting it, cf.
+    :func:`split_pages`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    :param docname: The document name where the page is hosted.
+    :param parts: The names of the documents the page is split into.
+
+    :rtype: :class:`docutils.nodes.bullet_list`
+    """
+    index = nodes.bullet_list(classes=['wikipage-index'])
+    for part_doc in parts:
+        part = env.wikiparts[part_doc]
+        try:
+            uri = app.builder.get_relative_uri(docname, part_doc)
+        except NoUri:
+            continue
+        anchors = getattr(env, 'wikianchors', {}).get(part_doc, {})
+        for title in part['roots']:
+            anchor = anchors.get((part['page'], 0, title),
+                                 _name_to_anchor(title))
+            ref = nodes.reference('', '', internal=True,
+                                  refuri=uri + '#' + anchor)
+            ref += nodes.Text(title, title)
+            item = nodes.list_item()
+            item += nodes.paragraph('', '', ref)
+            index += item
+    return index
+
+
+def _split_runs(env, page_name, split):
+    # (top level titles, all titles) of each run of consecutive top level
+    # subtrees with at most `split` sections, unless a subtree is larger.
+    sections = sorted(env.wikisections.get(page_name, []),
+                      key=lambda s: s['node']['options']['title'])
+    titles = [info['node']['options']['title'] for info in sections]
+    if len(set(titles)) != len(titles):
+        return []
+    tree = _wiki_tree(sections)
+    runs, run, size = [], [], 0
+    for root in tree.roots:
+        count = len(_subtree(tree, [root]))
+        if run and size + count > split:
+            runs.append(run)
+            run, size = [], 0
+        run.append(root)
+        size += count
+    if run:
+        runs.append(run)
+    return [([titles[idx] for idx in run],
+             sorted(titles[idx] for idx in _subtree(tree, run)))
+            for run in runs]
+
+
+_PART_SOURCE = u""":orphan:
+
+.. Generated by sphinxcontrib-wiki from the wiki page "{name}" in {host},
+   cf. its :split: option. Changes to this file are lost.
+
+.. wikipage:: {name}
+   :title: {title} ({part}/{count})
+   :part: {part}
+"""
+
+
+# the start of every document generated by split_pages() and
+# write_autopages(), cf. _generated()
+_GENERATED_HEADER = u':orphan:\n\n.. Generated by sphinxcontrib-wiki '
+
+
+def _generated(path):
+    # Whether a source file starts with the header of generated documents;
+    # files without it are never overwritten or removed.
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            return f.read(len(_GENERATED_HEADER)) == _GENERATED_HEADER
+    except (IOError, UnicodeError):
+        return False
+
+
+def _remove_generated(app, env, docname):
+    # Forgets a generated document that is no longer needed and removes its
+    # file, unless that was replaced by a document of the user's own.
+    path = env.doc2path(docname)
+    if os.path.exists(path) and not _generated(path):
+        return
+    if os.path.exists(path):
+        os.remove(path)
+    app.emit('env-purge-doc', env, docname)
+    env.clear_doc(docname)
+    env.found_docs.discard(docname)
+
+
+def _write_source(path, source):
+    # Writes a file unless it already has the given contents, such that sphinx
+    # does not consider it changed. Returns whether the file was written.
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            if f.read() == source:
+                return False
+    except IOError:
+        pass
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return True
+
+
+def split_pages(app, env):
+    """Generates the documents that pages with a ``split`` option are split
+    into and reads those that changed. Each document, named after the host,
+    the page and its number, e.g ``index-faq-2``, contains a run of
+    consecutive top level subtrees of the page with at most ``split``
+    sections (or a single larger subtree). Generated documents that are no
+    longer needed are removed. The parts of each split page are recorded in
+    ``env.wikisplits``, the contents of each part in ``env.wikiparts`` and the
+    generated documents in ``env.wikigenerated``.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    :returns: The generated documents that were read and their hosts, to be
+        written.
+    :rtype: :class:`set[str]`
+
+    .. wikisection:: faq
+        :title: Splitting Large Pages
+        :parent: Assembling Pages Once
+
+        A page with many sections makes for a large HTML file which is slow to
+        load, and to write. The ``split`` option of the ``wikipage``
+        directive moves its sections to separate documents of at most the
+        given number of sections each, keeping whole top level sections
+        together, while the host document lists links to them:
+
+        .. code-block:: rst
+
+            .. wikipage:: faq
+                :title: Frequently Asked Questions
+                :split: 50
+
+        These documents are generated next to the host document, much like
+        ``sphinx.ext.autosummary`` does, and are excluded from all toctrees.
+        Builders other than HTML builders still render the whole page in the
+        host document.
+    """
+    parts = {}
+    for host in sorted(env.wikisplits):
+        for name, split in sorted(env.wikisplits[host].items()):
+            split['parts'] = []
+            runs = []
+            if harvested(app.config, name, None):
+                runs = _split_runs(env, name, split['split'])
+            for idx, (roots, titles) in enumerate(runs):
+                docname = '%s-%s-%d' % (host, _name_to_anchor(name), idx + 1)
+                if docname in env.found_docs and \
+                        not _generated(env.doc2path(docname)):
+                    app.warn('Not splitting wikipage "%s" into existing '
+                             'document %s' % (name, docname), host)
+                    break
+                split['parts'].append(docname)
+                parts[docname] = {
+                    'host': host,
+                    'page': name,
+                    'roots': roots,
+                    'titles': titles,
+                    'source': _PART_SOURCE.format(
+                        name=name, host=host, title=split['title'],
+                        part=idx + 1, count=len(runs)),
+                }
+
+    written = set()
+    for docname, part in sorted(parts.items()):
+        if _write_source(env.doc2path(docname), part.pop('source')) or \
+                docname not in env.all_docs:
+            env.found_docs.add(docname)
+            written.add(docname)
+    hosts = set(parts[docname]['host'] for docname in written)
+    for docname in sorted(env.wikigenerated - set(parts)):
+        _remove_generated(app, env, docname)
+        if docname in env.wikiparts:
+            hosts.add(env.wikiparts[docname]['host'])
+
+    env.wikigenerated = set(parts)
+    env.wikiparts = parts
+    _reread(app, env, written)
+    return written | hosts
+
+
+def env_check_consistency(app, env):
+    """Handler for sphinx's ``env-check-consistency`` event, i.e right before
+    writing output and after the build environment is pickled. Page trees
+    assembled in a previous build are forgotten here, and with
+    ``wiki_preassemble = True`` the trees of all hosted pages are assembled
+    right away, cf. :func:`section_tree`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    .. wikisection:: faq
+        :title: Assembling Pages Once
+        :parent: _none_
+
+        The section tree of a wiki page is assembled once per build and
+        shared by all documents hosting the page, each of which only resolves
+        references and assigns anchors in its own copy. By default, a tree is
+        assembled when the first of its hosts is written. With
+        ``wiki_preassemble = True`` all trees are assembled before any
+        document is written, in the main sphinx process, such that processes
+        writing documents in parallel start out with them. The trees are
+        never pickled.
+    """
+    env.wikitrees = {}
+    if not app.config['wiki_enabled'] or not app.config['wiki_preassemble']:
+        return
+    for name, hosts in sorted(getattr(env, 'wikipages', {}).items()):
+        if hosts and harvested(app.config, name, None):
+            env.wikitrees[name] = section_tree(app, env, hosts[0], name)
+
+
+def env_purge_doc(app, env, docname):
+    """Standard handler for sphinx's ``env-purge-doc`` event. We need to
+    implement this because we store data in the build environment, cf.
+    ``sphinx.ext.todo``.
+    """
+    if not hasattr(env, 'wikisections'):
+        return
+    for name in env.wikisections:
+        env.wikisections[name] = [sec for sec in env.wikisections[name]
+                                  if sec['docname'] != docname]
+    for name in getattr(env, 'wikipages', {}):
+        env.wikipages[name] = [host for host in env.wikipages[name]
+                               if host != docname]
+    if hasattr(env, 'wikixrefs'):
+        names = getattr(env, 'wikidefs', {}).pop(docname, ())
+        _drop_xrefs(env, [docname], names)
+    if hasattr(env, 'wikiunresolved'):
+        env.wikiunresolved.pop(docname, None)
+    if hasattr(env, 'wikidocs'):
+        env.wikidocs.discard(docname)
+    for name in getattr(env, 'wikiunhosted', {}):
+        env.wikiunhosted[name] = [doc for doc in env.wikiunhosted[name]
+                                  if doc != docname]
+    if hasattr(env, 'wikisplits'):
+        env.wikisplits.pop(docname, None)
+    if hasattr(env, 'wikitargets'):
+        env.wikitargets.pop(docname, None)
+    if not hasattr(env, 'wikipurged'):
+        env.wikipurged = set()
+    env.wikipurged.add(docname)
+    env.wikitrees = {}
+
+
+def env_merge_info(app, env, docnames, other):
+    """Standard handler for sphinx's ``env-murge-info`` event. We need to
+    implement this because we store data in the build environment, cf.
+    ``sphinx.ext.todo``."""
+    if not hasattr(other, 'wikisections'):
+        return
+    if not hasattr(env, 'wikisections'):
+        env.wikisections = {}
+    if not hasattr(env, 'wikipages'):
+        env.wikipages = {}
+    for name, sections in other.wikisections.items():
+        env.wikisections.setdefault(name, []).extend(
+            sec for sec in sections if sec['docname'] in docnames)
+    for name, hosts in getattr(other, 'wikipages', {}).items():
+        env.wikipages.setdefault(name, []).extend(
+            host for host in hosts if host in docnames)
+    if hasattr(other, 'wikidocs'):
+        if not hasattr(env, 'wikidocs'):
+            env.wikidocs = set()
+        env.wikidocs.update(other.wikidocs & set(docnames))
+    if hasattr(other, 'wikisplits'):
+        if not hasattr(env, 'wikisplits'):
+            env.wikisplits = {}
+        env.wikisplits.update((docname, pages) for docname, pages in
+                              other.wikisplits.items() if docname in docnames)
+
+
+def env_updated(app, env):
+    """Handler for sphinx's ``env-updated`` event, i.e once all documents are
+    read. Sections of pages which no document hosts are dropped from the
+    build environment, keeping it small while writing and when pickled; the
+    documents they came from are remembered in ``env.wikiunhosted`` and
+    re-read once a matching ``wikipage`` shows up. Hosts of pages that changed
+    are written, cf. :func:`page_digests`, and remaining sections are moved to
+    the section store if enabled, cf. :func:`store_sections`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    :returns: The documents that were re-read or are outdated, to be written
+        as well.
+    :rtype: :class:`list[str]`
+
+    .. wikisection:: faq
+        :title: Unhosted Pages
+        :parent: _none_
+
+        Sections of pages for which there is no ``wikipage`` directive in any
+        document are dropped once all documents are read, with a single
+        warning listing such pages. If one of these pages is added later on,
+        the documents containing its sections are read again.
+    """
+    for attr in ['wikisections', 'wikipages', 'wikiunhosted', 'wikisplits',
+                 'wikiparts']:
+        if not hasattr(env, attr):
+            setattr(env, attr, {})
+    for attr in ['wikigenerated', 'wikiautodocs']:
+        if not hasattr(env, attr):
+            setattr(env, attr, set())
+    # Assembled page trees are not pickled, cf. env_check_consistency(), and
+    # the tables of python object names and document URIs are rebuilt once
+    # needed, cf. _python_suffixes() and _target_docname().
+    env.wikitrees = {}
+    env.wikisuffixes = None
+    env.wikiuris = None
+    changed = set()
+    if app.config['wiki_enabled'] and app.config['wiki_harvest_paths']:
+        changed = harvest_sections(app, env)
+    autodocs = set()
+    if app.config['wiki_enabled']:
+        autodocs = write_autopages(app, env)
+    hosted = set(name for name, hosts in env.wikipages.items() if hosts)
+
+    reread = set()
+    for name in hosted & set(env.wikiunhosted):
+        reread.update(env.wikiunhosted.pop(name))
+    _reread(app, env, reread)
+
+    dropped = []
+    for name in sorted(set(env.wikisections) - hosted):
+        sections = env.wikisections.pop(name)
+        if not sections:
+            continue
+        docnames = env.wikiunhosted.setdefault(name, [])
+        docnames.extend(set(sec['docname'] for sec in sections) -
+                        set(docnames))
+        dropped.append(name)
+    if dropped:
+        app.warn('Dropping sections of %d unhosted wikipages: %s' %
+                 (len(dropped), ', '.join(dropped)))
+
+    for name in changed & hosted:
+        reread.update(env.wikipages[name])
+    if app.config['wiki_enabled']:
+        reread.update(split_pages(app, env))
+        reread.update(page_digests(app, env))
+    reread.update(autodocs)
+    purged = getattr(env, 'wikipurged', set())
+    if app.config['wiki_xref_cache'] and purged:
+        reread.update(record_definitions(env, purged))
+
+    env.wikipurged = set()
+
+    if app.config['wiki_section_store']:
+        store_sections(app, env)
+    return sorted(reread & env.found_docs)
+
+
+# directory of the documents generated for wiki pages, cf. write_autopages()
+_AUTOPAGE_DIR = 'wiki'
+
+_AUTOPAGE_SOURCE = u""":orphan:
+
+.. Generated by sphinxcontrib-wiki for the wiki page "{name}", cf.
+   wiki_autopages. Changes to this file are lost.
+
+.. wikipage:: {name}
+   :title: {title}
+   :autopage:
+"""
+
+
+def write_autopages(app, env):
+    """Generates a host document for each wiki page with sections but no
+    ``wikipage`` directive in any other document, as configured by
+    ``wiki_autopages``, and reads those that changed. The documents are named
+    after their page in the ``wiki`` directory of the project, e.g
+    ``wiki/faq``. Generated documents that are no longer needed are removed;
+    all others are recorded in ``env.wikiautodocs``.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    :returns: The generated documents that were read, to be written.
+    :rtype: :class:`set[str]`
+
+    .. wikisection:: faq
+        :title: Pages without Hosts
+        :parent: Unhosted Pages
+
+        With ``wiki_autopages = True`` each page that has sections but no
+        ``wikipage`` directive gets a document of its own, ``wiki/<page>``,
+        titled by the name of the page; ``wiki_autopages`` can also be a
+        dictionary of page names to titles, limiting this to the given pages.
+        As separate documents, these pages are written, and rewritten,
+        independently of each other. They are generated in the source
+        directory, much like ``sphinx.ext.autosummary`` does, and are not part
+        of any toctree unless listed in one.
+    """
+    autopages = app.config['wiki_autopages']
+    pages = {}
+    if autopages:
+        names = set(name for name, sections in env.wikisections.items()
+                    if sections) | set(env.wikiunhosted)
+        for name in sorted(names):
+            hosts = [host for host in env.wikipages.get(name, [])
+                     if host not in env.wikiautodocs and
+                     not _generated(env.doc2path(host))]
+            if hosts or not harvested(app.config, name, None):
+                continue
+            if isinstance(autopages, dict):
+                if name not in autopages:
+                    continue
+                title = autopages[name]
+            else:
+                title = name
+            docname = _AUTOPAGE_DIR + '/' + _name_to_anchor(name)
+            if docname in env.found_docs and \
+                    not _generated(env.doc2path(docname)):
+                app.warn('Not generating wikipage "%s" in existing document '
+                         '%s' % (name, docname))
+                continue
+            pages[docname] = _AUTOPAGE_SOURCE.format(name=name, title=title)
+
+    written = set()
+    for docname, source in sorted(pages.items()):
+        path = env.doc2path(docname)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        if _write_source(path, source) or docname not in env.all_docs:
+            env.found_docs.add(docname)
+            written.add(docname)
+    for docname in sorted(env.wikiautodocs - set(pages)):
+        _remove_generated(app, env, docname)
+    env.wikiautodocs = set(pages)
+
+    _reread(app, env, written)
+    return written
+
+
+def page_digests(app, env):
+    """Computes a digest of the sections of each hosted wiki page, i.e of
+    their documents, depths, options and contents, and compares it to the
+    digest of the previous build, stored in ``env.wikidigests``. Hosts of
+    pages whose digest changed are outdated, and so are hosts whose pages
+    have references to documents which were read again since (cf.
+    :func:`page_targets`); all other hosts are left alone.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    :returns: The outdated hosts.
+    :rtype: :class:`set[str]`
+
+    .. wikisection:: faq
+        :title: Rewriting Hosts
+        :parent: Assembling Pages Once
+
+        A document hosting a wiki page is written again when its page changes,
+        i.e when any of its sections is added, removed, moved or edited, or
+        when a document its references point to is read again, and only then
+        (unless sphinx writes it for other reasons, e.g because the document
+        itself changed). With ``wiki_stable_output = True`` the HTML files of
+        hosts which are written with unchanged contents also keep their
+        previous modification time, e.g for ``rsync`` to skip them.
+    """
+    old = getattr(env, 'wikidigests', {})
+    env.wikidigests = {}
+    outdated = set()
+    for name in sorted(env.wikipages):
+        if not env.wikipages[name]:
+            continue
+        sections = sorted(env.wikisections.get(name, []),
+                          key=lambda s: s['node']['options']['title'])
+        env.wikidigests[name] = _digest(repr([
+            (sec['docname'], sec['depth'],
+             sorted(sec['node']['options'].items()), sec.get('digest'))
+            for sec in sections]))
+        if env.wikidigests[name] != old.get(name):
+            outdated.update(env.wikipages[name])
+
+    purged = getattr(env, 'wikipurged', set())
+    for host, targets in getattr(env, 'wikitargets', {}).items():
+        if purged.intersection(targets):
+            outdated.add(host)
+    return outdated
+
+
+def _reread(app, env, docnames):
+    for docname in sorted(set(docnames) & env.found_docs):
+        app.emit('env-purge-doc', env, docname)
+        env.clear_doc(docname)
+        env.read_doc(docname, app)
+
+
+def harvest_sections(app, env):
+    """Collects sections from the python sources listed in
+    ``wiki_harvest_paths`` into the build environment, replacing the ones
+    collected in previous builds, cf. :mod:`sphinxcontrib.wiki.harvest`. The
+    bodies of these sections are parsed when their pages are assembled, cf.
+    :func:`parse_deferred`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    :returns: The names of pages whose harvested sections have changed.
+    :rtype: :class:`set[str]`
+    """
+    # NOTE imported here such that the module can be run as a script, cf.
+    # python -m sphinxcontrib.wiki.harvest.
+    from . import harvest
+
+    old, new = {}, {}
+    for name, sections in env.wikisections.items():
+        old[name] = [sec['harvested'] for sec in sections
+                     if 'harvested' in sec]
+        sections[:] = [sec for sec in sections if 'harvested' not in sec]
+
+    paths = [os.path.join(app.confdir, path)
+             for path in app.config['wiki_harvest_paths']]
+    errors = []
+    records = harvest.harvest(paths, errors)
+    for path, message in errors:
+        app.warn('Ignoring python file which cannot be parsed: %s' % message,
+                 path)
+    for record in records:
+        if not record['title']:
+            app.warn('Ignoring wikipage section with no title in %s.' %
+                     record['source'])
+            continue
+        if not harvested(app.config, record['page_name'], record['docname']):
+            continue
+
+        title = record['title']
+        sec = wikisection()
+        sec['options'] = {
+            'page_name': record['page_name'],
+            'title': title,
+            'parent': record['parent'],
+        }
+        sec += nodes.title(title, title)
+        sec['deferred'] = {
+            'lines': record['lines'],
+            'items': [(record['source'], record['offset'] + idx)
+                      for idx in range(len(record['lines']))],
+            'ref_context': record['ref_context'],
+        }
+        sec['ids'] = [_name_to_anchor(title)]
+
+        signature = (record['docname'], title, record['parent'],
+                     tuple(record['lines']))
+        env.wikisections.setdefault(record['page_name'], []).append({
+            'docname': record['docname'],
+            'depth': record['depth'],
+            'node': sec,
+            'source': record['source'],
+            'harvested': signature,
+            'digest': _section_digest(sec),
+        })
+        new.setdefault(record['page_name'], []).append(signature)
+
+    return set(name for name in set(old) | set(new)
+               if old.get(name, []) != new.get(name, []))
+
+
+# Attributes of the build environment which are populated while writing
+# output, i.e after sphinx has pickled the build environment. They are saved
+# separately upon build-finished and restored upon builder-inited.
+_WRITE_STATE = ['wikixrefs', 'wikiunresolved', 'wikianchors',
+                'wikitargets', 'wikisnapshot']
+
+
+def _write_state_path(app):
+    return os.path.join(app.doctreedir, 'wikistate.pickle')
+
+
+def builder_inited(app):
+    """Handler for sphinx's ``builder-inited`` event. This is where we hook
+    into autodoc, if loaded, and where the state of the build environment
+    populated while writing the previous build is restored, cf.
+    :func:`resolve_xref` and :func:`write_unresolved_report`.
+    """
+    env = app.env
+    if 'sphinx.ext.autodoc' in app.extensions:
+        app.connect('autodoc-process-docstring', autodoc_process_docstring)
+
+    state = {}
+    # A build environment without these attributes is a fresh one; the state
+    # of the previous build was never purged against it.
+    if any(hasattr(env, attr) for attr in _WRITE_STATE):
+        try:
+            with open(_write_state_path(app), 'rb') as f:
+                state = pickle.load(f)
+        except Exception:
+            state = {}
+    for attr in _WRITE_STATE:
+        setattr(env, attr, state.get(attr, {}) if hasattr(env, attr) else {})
+
+
+def html_page_context(app, pagename, templatename, context, doctree):
+    """Handler for sphinx's ``html-page-context`` event. The section search
+    script is only needed on the search page, cf. :func:`write_search_index`,
+    and lazily loaded section bodies are moved out of the page here, cf.
+    :func:`write_lazy_bodies`.
+    """
+    if pagename == 'search' and app.config['wiki_search_index']:
+        context['script_files'] = context['script_files'] + [
+            '_static/wikisearch.js']
+    if app.config['wiki_lazy_sections'] and \
+            app.builder.name in _LAZY_BUILDERS and 'body' in context:
+        write_lazy_bodies(app, pagename, context)
+
+
+_LAZY_RE = re.compile(r'<!--wiki-lazy:(\d+)-->(.*?)<!--/wiki-lazy:\1-->',
+                      re.DOTALL)
+
+_LAZY_PLACEHOLDER = (u'<div class="wikipage-lazy">'
+                     u'<a class="wikipage-lazy-toggle" href="%s">%s</a></div>')
+
+# Fragments keep their links relative to their page, which is made the base
+# of the fragment for it to be opened on its own, cf. _LAZY_JS.
+_LAZY_FRAGMENT = u"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<base href="%s">
+<title>%s</title>
+</head>
+<body>
+<div class="wikipage-lazy-body">%s</div>
+</body>
+</html>
+"""
+
+
+def write_lazy_bodies(app, pagename, context):
+    """Replaces the section bodies marked in the rendered body of an HTML page
+    (cf. :func:`mark_lazy_bodies`) by links to separate files, written to
+    ``_wiki/<pagename>-<number>.html`` in the output directory, which the
+    accompanying ``_static/wikilazy.js`` fetches in place. Each file is a
+    small page of its own whose base is the original page, such that the
+    links of the body also work when it is opened without javascript. Files
+    are named after the page rather than put in a directory of it, such that
+    the fragments of a page never end up inside those of another one, e.g of
+    ``sub`` and ``sub/host``.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param pagename: The name of the page.
+    :param context: The template context of the page.
+    """
+    fragment_dir, base = os.path.split(
+        os.path.join(app.outdir, '_wiki', *pagename.split('/')))
+    stale_re = re.compile(re.escape(base) + r'-\d+\.html$')
+    if os.path.isdir(fragment_dir):
+        for name in os.listdir(fragment_dir):
+            if stale_re.match(name):
+                os.remove(os.path.join(fragment_dir, name))
+
+    def replace(match):
+        if not os.path.isdir(fragment_dir):
+            os.makedirs(fragment_dir)
+        name = '%s-%s.html' % (base, match.group(1))
+        page_uri = '../' * (pagename.count('/') + 1) + \
+            app.builder.get_target_uri(pagename)
+        with io.open(os.path.join(fragment_dir, name), 'w',
+                     encoding='utf-8') as f:
+            f.write(_LAZY_FRAGMENT % (page_uri, context.get('title', u''),
+                                      match.group(2)))
+        uri = context['pathto']('_wiki/%s-%s.html' %
+                                (pagename, match.group(1)), 1)
+        return _LAZY_PLACEHOLDER % (uri, sphinx.locale._('Show more'))
+
+    body = _LAZY_RE.sub(replace, context['body'])
+    if body != context['body']:
+        context['body'] = body
+        context['script_files'] = context['script_files'] + [
+            '_static/wikilazy.js']
+
+
+def build_finished(app, exception):
+    """Handler for sphinx's ``build-finished`` event. This is where the state
+    of the build environment populated while writing is saved, cf.
+    :func:`builder_inited`, and the unresolved reference report and the section
+    search index are written, cf. :func:`write_unresolved_report` and
+    :func:`write_search_index`."""
+    if exception is not None:
+        return
+    env = app.builder.env
+    if hasattr(env, 'wikianchors'):
+        for docname in list(env.wikianchors):
+            if docname not in env.all_docs:
+                del env.wikianchors[docname]
+    if app.config['wiki_diff_report']:
+        write_diff_report(app, env)
+    if all(hasattr(env, attr) for attr in _WRITE_STATE):
+        with open(_write_state_path(app), 'wb') as f:
+            pickle.dump({attr: getattr(env, attr) for attr in _WRITE_STATE},
+                        f, pickle.HIGHEST_PROTOCOL)
+    if app.config['wiki_unresolved_report']:
+        write_unresolved_report(app, env)
+    if app.config['wiki_search_index'] and app.builder.format == 'html':
+        write_search_index(app, env)
+    if app.config['wiki_lazy_sections'] and \
+            app.builder.name in _LAZY_BUILDERS:
+        _write_static(app, 'wikilazy.js', _LAZY_JS)
+    restore_outputs()
+
+
+def section_snapshot(env):
+    """Takes a snapshot of all stored sections, cf. :func:`diff_snapshots`.
+
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    :returns: A dictionary mapping page names to dictionaries mapping section
+        titles to dictionaries with keys ``docname``, ``parent`` (the title
+        of the parent section in the page tree, or ``None``) and ``digest``.
+    :rtype: :class:`dict`
+    """
+    snapshot = {}
+    for name, sections in env.wikisections.items():
+        sections = sorted(sections,
+                          key=lambda s: s['node']['options']['title'])
+        titles = [info['node']['options']['title'] for info in sections]
+        if not sections or len(set(titles)) != len(titles):
+            continue
+        parents = {}
+        for idx, children in enumerate(_wiki_tree(sections).children):
+            for child in children:
+                parents[child] = titles[idx]
+        snapshot[name] = {
+            titles[idx]: {
+                'docname': info['docname'],
+                'parent': parents.get(idx),
+                'digest': info.get('digest'),
+            } for idx, info in enumerate(sections)
+        }
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """Compares two snapshots of the stored sections, cf.
+    :func:`section_snapshot`, section by section.
+
+    :param old: The snapshot of the previous build.
+    :param new: The snapshot of this build.
+
+    :returns: A dictionary with keys ``added``, ``removed``, ``moved`` (the
+        parent changed) and ``edited`` (the contents changed), each a list of
+        dictionaries with keys ``page``, ``title`` and ``docname``. Moved
+        sections also have keys ``old_parent`` and ``new_parent``.
+    :rtype: :class:`dict`
+    """
+    diff = {'added': [], 'removed': [], 'moved': [], 'edited': []}
+    for name in sorted(set(old) | set(new)):
+        old_page, new_page = old.get(name, {}), new.get(name, {})
+        for title in sorted(set(old_page) | set(new_page)):
+            before, after = old_page.get(title), new_page.get(title)
+            entry = {
+                'page': name,
+                'title': title,
+                'docname': (after or before)['docname'],
+            }
+            if before is None:
+                diff['added'].append(entry)
+            elif after is None:
+                diff['removed'].append(entry)
+            else:
+                if before['parent'] != after['parent']:
+                    diff['moved'].append(dict(entry,
+                                              old_parent=before['parent'],
+                                              new_parent=after['parent']))
+                if before['digest'] != after['digest']:
+                    diff['edited'].append(entry)
+    return diff
+
+
+def write_diff_report(app, env):
+    """Writes the sections that were added, removed, moved or edited since the
+    previous build, cf. :func:`diff_snapshots`, as a JSON report in the output
+    directory, named by ``wiki_diff_report``. The snapshot of this build is
+    saved along with the state of the build environment populated while
+    writing, cf. :func:`builder_inited`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+
+    .. wikisection:: faq
+        :title: Changes between Builds
+        :parent: _none_
+
+        Setting ``wiki_diff_report`` to a file name writes a JSON report of
+        the wiki sections that were added, removed, moved to another parent
+        or edited since the previous build to the output directory, e.g for
+        release notes. The report is computed from digests of the contents of
+        the sections, which are taken when they are read, without rendering
+        anything. The first build reports all sections as added.
+    """
+    snapshot = section_snapshot(env)
+    diff = diff_snapshots(getattr(env, 'wikisnapshot', {}), snapshot)
+    env.wikisnapshot = snapshot
+
+    path = os.path.join(app.outdir, app.config['wiki_diff_report'])
+    with open(path, 'w') as f:
+        json.dump(diff, f, indent=2, sort_keys=True)
+    app.info('wiki sections: %s' % ', '.join(
+        '%d %s' % (len(diff[key]), key)
+        for key in ['added', 'removed', 'moved', 'edited']))
+
+
+def write_unresolved_report(app, env):
+    """Writes all references in wiki sections which could not be resolved, in
+    any of the documents hosting wiki pages, to a single JSON report in the
+    output directory, named by ``wiki_unresolved_report``. Each entry contains
+    the hosting document, the document the section comes from, the section
+    title, and the domain, role and target of the reference.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    """
+    report = []
+    for docname in sorted(env.wikiunresolved):
+        report.extend(env.wikiunresolved[docname])
+
+    path = os.path.join(app.outdir, app.config['wiki_unresolved_report'])
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    if report:
+        app.warn('%d unresolved references in wiki sections, see %s' %
+                 (len(report), path))
+
+
+_WORD_RE = re.compile(r'\w\w+', re.UNICODE)
+
+
+def _terms(text):
+    return set(word.lower() for word in _WORD_RE.findall(text))
+
+
+def write_search_index(app, env):
+    """Writes a section-level search index for all hosted wiki pages to
+    ``_static/wikisearch.json.gz`` in the output directory, along with an
+    uncompressed copy for browsers without ``DecompressionStream`` and the
+    script that queries it. The index has the following structure:
+
+    .. code-block:: js
+
+        {
+          "sections": [[title, uri], ...],
+          "titleterms": {term: [section index, ...], ...},
+          "terms": {term: [section index, ...], ...}
+        }
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param env: The build environment (i.e an instance of
+        :class:`sphinx.environment.BuildEnvironment`).
+    """
+    sections, titleterms, terms = [], {}, {}
+    wikipages = getattr(env, 'wikipages', {})
+    wikisections = getattr(env, 'wikisections', {})
+    for page_name in sorted(wikipages):
+        page_sections = wikisections.get(page_name, [])
+        options = [info['node']['options'] for info in page_sections]
+        if _duplicate_title(options) is not None:
+            continue
+        for host in sorted(wikipages[page_name]):
+            # document containing each section of a split page (dict)
+            part_docs = {}
+            split = getattr(env, 'wikisplits', {}).get(host, {})
+            for part_doc in split.get(page_name, {}).get('parts', []):
+                for title in env.wikiparts[part_doc]['titles']:
+                    part_docs[title] = part_doc
+            for sec_info in page_sections:
+                node = sec_info['node']
+                title = node['options']['title']
+                docname = part_docs.get(title, host)
+                try:
+                    uri = app.builder.get_target_uri(docname)
+                except NoUri:
+                    continue
+                anchors = env.wikianchors.get(docname, {})
+                anchor = anchors.get((page_name, 0, title), node['ids'][0])
+                idx = len(sections)
+                sections.append([title, uri + '#' + anchor])
+                for term in _terms(title):
+                    titleterms.setdefault(term, []).append(idx)
+                for term in _terms(_section_text(app, sec_info)):
+                    terms.setdefault(term, []).append(idx)
+
+    index = json.dumps({
+        'sections': sections,
+        'titleterms': titleterms,
+        'terms': terms,
+    }, separators=(',', ':'), sort_keys=True)
+
+    static_dir = os.path.join(app.outdir, '_static')
+    if not os.path.isdir(static_dir):
+        os.makedirs(static_dir)
+    # A fixed mtime keeps the output identical across identical builds.
+    with open(os.path.join(static_dir, 'wikisearch.json.gz'), 'wb') as f:
+        with gzip.GzipFile('', 'wb', 9, f, mtime=0) as gz:
+            gz.write(index.encode('utf-8'))
+    with open(os.path.join(static_dir, 'wikisearch.json'), 'wb') as f:
+        f.write(index.encode('utf-8'))
+    _write_static(app, 'wikisearch.js', _SEARCH_JS)
+
+
+def _write_static(app, filename, source):
+    static_dir = os.path.join(app.outdir, '_static')
+    if not os.path.isdir(static_dir):
+        os.makedirs(static_dir)
+    with open(os.path.join(static_dir, filename), 'wb') as f:
+        f.write(source.encode('utf-8'))
+
+
+# Loaded only on the search page: fetches the section index on demand and
+# lists matching sections above the regular search results.
+_SEARCH_JS = u"""/*
+ * wikisearch.js
+ * ~~~~~~~~~~~~~
+ *
+ * Section-level search for wiki pages, generated by sphinxcontrib-wiki.
+ */
+
+var WikiSearch = {
+
+  index: null,
+
+  load: function(callback) {
+    if (WikiSearch.index !== null) {
+      callback(WikiSearch.index);
+      return;
+    }
+    var done = function(text) {
+      WikiSearch.index = JSON.parse(text);
+      callback(WikiSearch.index);
+    };
+    var plain = function() {
+      WikiSearch.fetch('wikisearch.json', function(bytes) {
+        done(new TextDecoder('utf-8').decode(bytes));
+      }, function() {
+        callback(null);
+      });
+    };
+    WikiSearch.fetch('wikisearch.json.gz', function(bytes) {
+      // servers may already have decoded the gzip content for us
+      if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+        done(new TextDecoder('utf-8').decode(bytes));
+      } else if (typeof DecompressionStream !== 'undefined') {
+        var stream = new Blob([bytes]).stream().pipeThrough(
+          new DecompressionStream('gzip'));
+        new Response(stream).text().then(done, plain);
+      } else {
+        plain();
+      }
+    }, plain);
+  },
+
+  fetch: function(filename, callback, fail) {
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', DOCUMENTATION_OPTIONS.URL_ROOT + '_static/' + filename);
+    xhr.responseType = 'arraybuffer';
+    xhr.onload = function() {
+      if (xhr.status === 200)
+        callback(new Uint8Array(xhr.response));
+      else
+        fail();
+    };
+    xhr.onerror = fail;
+    xhr.send();
+  },
+
+  query: function(index, query) {
+    var words = query.toLowerCase().match(/\\w\\w+/g) || [];
+    var scores = null;
+    $.each(words, function(i, word) {
+      var found = {};
+      $.each([['titleterms', 2], ['terms', 1]], function(j, kind) {
+        $.each(index[kind[0]], function(term, secs) {
+          if (term.indexOf(word) !== 0)
+            return;
+          $.each(secs, function(k, sec) {
+            found[sec] = Math.max(found[sec] || 0, kind[1]);
+          });
+        });
+      });
+      if (scores === null) {
+        scores = found;
+      } else {
+        // all words must match
+        $.each(scores, function(sec) {
+          if (!(sec in found))
+            delete scores[sec];
+          else
+            scores[sec] += found[sec];
+        });
+      }
+    });
+    var results = $.map(scores || {}, function(score, sec) {
+      return [[score, parseInt(sec, 10)]];
+    });
+    results.sort(function(a, b) { return (b[0] - a[0]) || (a[1] - b[1]); });
+    return $.map(results, function(result) {
+      return [index.sections[result[1]]];
+    });
+  },
+
+  init: function() {
+    var params = $.getQueryParameters();
+    if (!params.q || !params.q[0])
+      return;
+    WikiSearch.load(function(index) {
+      var out = $('<div id="wiki-search-results"/>')
+        .append($('<h2/>').text('Wiki Sections'));
+      if (index === null) {
+        out.append($('<p/>').text('The wiki sections could not be searched.'));
+      } else {
+        var results = WikiSearch.query(index, params.q[0]);
+        if (!results.length)
+          return;
+        var list = $('<ul class="search"/>');
+        $.each(results, function(i, result) {
+          var link = $('<a/>').text(result[0]).attr(
+            'href', DOCUMENTATION_OPTIONS.URL_ROOT + result[1]);
+          list.append($('<li/>').append(link));
+        });
+        out.append(list);
+      }
+      if ($('#search-results').length)
+        $('#search-results').before(out);
+      else
+        $('div.body').append(out);
+    });
+  }
+};
+
+$(document).ready(function() {
+  WikiSearch.init();
+});
+"""
+
+
+# Loaded on pages with lazily loaded section bodies, cf. write_lazy_bodies().
+_LAZY_JS = u"""/*
+ * wikilazy.js
+ * ~~~~~~~~~~~
+ *
+ * Lazily loaded wiki section bodies, generated by sphinxcontrib-wiki.
+ */
+
+$(document).ready(function() {
+  $('a.wikipage-lazy-toggle').click(function(event) {
+    var link = $(this);
+    event.preventDefault();
+    $.get(link.attr('href'), function(html) {
+      var body = $($.parseHTML(html)).filter('div.wikipage-lazy-body');
+      link.parent().replaceWith(body.contents());
+    }, 'html').fail(function() {
+      // e.g. local files, which browsers may refuse to fetch
+      window.location.href = link.attr('href');
+    });
+  });
+});
+"""
+
+
+def _visit_wikisection(self, node): pass
+
+
+def _depart_wikisection(self, node): pass
+
+
+def setup(app):
+    """
+    Entry point to sphinx. We define:
+
+    1. Configuration parameters, all of which default to ``False`` unless
+       noted otherwise:
+
+       - ``wiki_enabled`` which turns our behavior on and off.
+       - ``wiki_search_index`` which turns the section search index on, cf.
+         :func:`write_search_index`.
+       - ``wiki_xref_cache`` which turns the reference cache on, cf.
+         :func:`resolve_xref`.
+       - ``wiki_diff_report``, a file name defaulting to ``None``, which
+         reports changed sections, cf. :func:`write_diff_report`.
+       - ``wiki_unresolved_report``, a file name defaulting to ``None``, and
+         ``wiki_keep_unresolved_text`` which control what happens to
+         references that cannot be resolved, cf.
+         :func:`write_unresolved_report`.
+       - ``wiki_prescan``, defaulting to ``True``, which skips documents
+         without wiki directives, cf. :func:`source_read`.
+       - ``wiki_deferred_parse`` which defers parsing section bodies until
+         pages are assembled, cf. :func:`parse_deferred`.
+       - ``wiki_pages_include``, ``wiki_pages_exclude`` and
+         ``wiki_docnames_include``, lists of glob patterns which limit the
+         sections that are collected; the include lists default to ``None``
+         and the exclude list to ``[]``, cf. :func:`harvested`.
+       - ``wiki_harvest_paths``, defaulting to ``[]``, a list of python
+         sources to collect sections from without importing them, cf.
+         :func:`harvest_sections`.
+       - ``wiki_section_store`` which keeps section bodies in a memory
+         mapped file instead of the build environment, cf.
+         :func:`store_sections`.
+       - ``wiki_preassemble`` which assembles all pages before any document
+         is written, cf. :func:`env_check_consistency`.
+       - ``wiki_autopages`` which generates host documents for pages that
+         have none, cf. :func:`write_autopages`.
+       - ``wiki_lazy_sections`` which moves section bodies out of HTML pages,
+         cf. :func:`mark_lazy_bodies`.
+       - ``wiki_stable_output`` which keeps the modification time of host
+         documents written with unchanged contents, cf.
+         :func:`restore_outputs`.
+       - ``wiki_parallel_jobs``, defaulting to ``1``, the number of processes
+         assembling pages with at least ``wiki_parallel_threshold`` sections,
+         defaulting to ``1000``, cf. :func:`section_tree`.
+
+    2. Two node types: :class:`wikisection`, and :class:`wikipage`.
+    3. Two directives: ``wikisection``, and ``wikipage`` with handlers
+       :class:`WikiSection` and :class:`WikiPage`.
+    4. Eight hooks, five of which -- :func:`source_read`,
+       :func:`doctree_read`, :func:`env_updated`,
+       :func:`env_check_consistency` and :func:`doctree_resolved` -- are
+       involved in moving sections from their original place to where the
+       corresponding page is included. Two others --
+       :func:`env_purge_doc` and :func:`env_merge_info` -- are implemented
+       to make our usage of the build environment parallel-friendly, and
+       :func:`env_get_outdated` reads documents whose stored sections are
+       lost again.
+    5. Three hooks -- :func:`builder_inited`, :func:`html_page_context` and
+       :func:`build_finished` -- which take care of the state of the build
+       environment populated while writing and the section search index.
+
+    """
+    app.add_config_value('wiki_enabled', False, 'html')
+    app.add_config_value('wiki_search_index', False, 'html')
+    app.add_config_value('wiki_xref_cache', False, '')
+    app.add_config_value('wiki_unresolved_report', None, '')
+    app.add_config_value('wiki_diff_report', None, '')
+    app.add_config_value('wiki_keep_unresolved_text', False, 'html')
+    app.add_config_value('wiki_prescan', True, 'env')
+    app.add_config_value('wiki_deferred_parse', False, 'env')
+    app.add_config_value('wiki_pages_include', None, 'env')
+    app.add_config_value('wiki_pages_exclude', [], 'env')
+    app.add_config_value('wiki_docnames_include', None, 'env')
+    app.add_config_value('wiki_harvest_paths', [], 'env')
+    app.add_config_value('wiki_section_store', False, 'env')
+    app.add_config_value('wiki_preassemble', False, '')
+    app.add_config_value('wiki_autopages', False, 'env')
+    app.add_config_value('wiki_lazy_sections', False, 'html')
+    app.add_config_value('wiki_stable_output', False, '')
+    app.add_config_value('wiki_parallel_jobs', 1, '')
+    app.add_config_value('wiki_parallel_threshold', 1000, '')
+
+    app.add_node(wikipage)
+    app.add_node(wikisection,
+                 html=(_visit_wikisection, _depart_wikisection),
+                 latex=(_visit_wikisection, _depart_wikisection),
+                 text=(_visit_wikisection, _depart_wikisection),
+                 man=(_visit_wikisection, _depart_wikisection),
+                 texinfo=(_visit_wikisection, _depart_wikisection))
+
+    app.add_directive('wikisection', WikiSection)
+    app.add_directive('wikipage', WikiPage)
+
+    app.connect('source-read', source_read)
+    app.connect('doctree-read', doctree_read)
+    app.connect('env-get-outdated', env_get_outdated)
+    app.connect('env-updated', env_updated)
+    app.connect('env-check-consistency', env_check_consistency)
+    app.connect('doctree-resolved', doctree_resolved)
+
+    app.connect('env-purge-doc', env_purge_doc)
+    app.connect('env-merge-info', env_merge_info)
+
+    app.connect('builder-inited', builder_inited)
+    app.connect('html-page-context', html_page_context)
+    app.connect('build-finished', build_finished)
+
+    return {'version': '0.5.0', 'parallel_read_safe': True}
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Collect wiki sections from python sources without importing them.
+
+.. wikisection:: intro
+    :title: Static Harvesting
+
+    Collecting sections from docstrings with autodoc requires importing every
+    documented module. Alternatively, ``wiki_harvest_paths`` can be set to a
+    list of python files or directories (relative to the configuration
+    directory) whose module, class and function docstrings are scanned for
+    ``wikisection`` directives using :mod:`ast`, i.e without importing
+    anything. Each module is treated as if it were documented in a document
+    named after the module, which determines the place of its sections in the
+    section hierarchy. The same scan can be run on its own:
+
+    .. code-block:: bash
+
+        python -m sphinxcontrib.wiki.harvest some_pkg/ other_pkg/
+
+    which prints the collected sections as JSON.
+"""
+import ast
+import json
+import os
+import re
+import sys
+
+_SECTION_RE = re.compile(r'^(\s*)\.\.\s+wikisection::\s*(\S+)\s*$')
+_OPTION_RE = re.compile(r'^\s*:(\w+):\s*(.*?)\s*$')
+# Lines starting literal blocks, whose contents are skipped; in particular
+# examples of wikisection directives in code blocks.
+_LITERAL_RE = re.compile(
+    r'^\s*(\.\.\s+(code-block|code|sourcecode|parsed-literal)::.*|.*::)\s*$')
+
+_DEFINITIONS = tuple(getattr(ast, name) for name in
+                     ['ClassDef', 'FunctionDef', 'AsyncFunctionDef']
+                     if hasattr(ast, name))
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip())
+
+
+def module_name(path, root=None):
+    """Determines the dotted module name of a python file, either relative to
+    a given root directory or, by default, by walking up the directories that
+    are packages, i.e that contain an ``__init__.py``.
+
+    :param path: Path to a python file.
+    :param root: Optional directory containing the top level package.
+
+    :rtype: :class:`str`
+    """
+    path = os.path.abspath(path)
+    if root is not None:
+        parts = os.path.relpath(path, root)[:-len('.py')].split(os.sep)
+        if parts[-1] == '__init__':
+            parts.pop()
+        return '.'.join(parts)
+
+    parts = [os.path.splitext(os.path.basename(path))[0]]
+    if parts[0] == '__init__':
+        parts = []
+    dirname = os.path.dirname(path)
+    while os.path.exists(os.path.join(dirname, '__init__.py')):
+        parts.insert(0, os.path.basename(dirname))
+        dirname = os.path.dirname(dirname)
+    return '.'.join(parts)
+
+
+def docstring_sections(docstring):
+    """Extracts all ``wikisection`` directives from a docstring.
+
+    :param docstring: A docstring as returned by :func:`ast.get_docstring`,
+        i.e with its indentation cleaned up.
+
+    :returns: A list of dictionaries with keys ``page_name``, ``title``,
+        ``parent``, ``lines`` (the body of the section, dedented), ``line``
+        and ``offset`` (line numbers of the directive and the body within the
+        docstring, starting from 0).
+    :rtype: :class:`list[dict]`
+    """
+    lines = docstring.splitlines()
+    sections = []
+    literal = None      # indentation of the current literal block
+    idx = 0
+    while idx < len(lines):
+        line = lines[idx]
+        idx += 1
+        if literal is not None:
+            if not line.strip() or _indent(line) > literal:
+                continue
+            literal = None
+        match = _SECTION_RE.match(line)
+        if not match:
+            if _LITERAL_RE.match(line):
+                literal = _indent(line)
+            continue
+        idx_directive = idx - 1
+        indent = len(match.group(1))
+        options = {}
+        while idx < len(lines) and _indent(lines[idx]) > indent and \
+                _OPTION_RE.match(lines[idx]):
+            key, value = _OPTION_RE.match(lines[idx]).groups()
+            options[key] = value
+            idx += 1
+
+        body = []
+        offset = idx
+        while idx < len(lines) and \
+                (not lines[idx].strip() or _indent(lines[idx]) > indent):
+            body.append(lines[idx])
+            idx += 1
+        while body and not body[0].strip():
+            body.pop(0)
+            offset += 1
+        while body and not body[-1].strip():
+            body.pop()
+        margin = min(_indent(line) for line in body if line.strip()) \
+            if body else 0
+
+        sections.append({
+            'page_name': match.group(2),
+            'title': options.get('title'),
+            'parent': options.get('parent', '_default_'),
+            'lines': [line[margin:] for line in body],
+            'line': idx_directive,
+            'offset': offset,
+        })
+    return sections
+
+
+def _docstrings(tree, modname):
+    # Yields (qualified name, ref_context, docstring) for a module and all
+    # classes and functions in it, in source order.
+    context = {'py:module': modname}
+    stack = [(tree, modname, [])]
+    while stack:
+        node, name, classes = stack.pop()
+        docstring = ast.get_docstring(node)
+        if docstring:
+            if isinstance(docstring, bytes):
+                docstring = docstring.decode('utf-8')
+            ref_context = dict(context)
+            if classes:
+                ref_context['py:class'] = '.'.join(classes)
+            yield name, ref_context, docstring
+
+        children = [child for child in node.body
+                    if isinstance(child, _DEFINITIONS)]
+        for child in reversed(children):
+            if isinstance(child, ast.ClassDef) and \
+                    isinstance(node, (ast.Module, ast.ClassDef)):
+                child_classes = classes + [child.name]
+            else:
+                child_classes = classes
+            stack.append((child, name + '.' + child.name, child_classes))
+
+
+def harvest_file(path, root=None):
+    """Collects all wiki sections from the docstrings of a python file.
+
+    :param path: Path to a python file.
+    :param root: Optional directory containing the top level package, cf.
+        :func:`module_name`.
+
+    :returns: A list of dictionaries as returned by
+        :func:`docstring_sections`, additionally with keys ``docname`` and
+        ``depth`` as :func:`sphinxcontrib.wiki.doctree_read` would compute
+        them, ``source`` and ``ref_context``.
+    :rtype: :class:`list[dict]`
+    """
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    modname = module_name(path, root)
+    records = []
+    for name, ref_context, docstring in _docstrings(tree, modname):
+        for record in docstring_sections(docstring):
+            record.update({
+                'docname': modname,
+                'depth': modname.count('.') + 1,
+                'source': '%s:docstring of %s' % (path, name),
+                'ref_context': ref_context,
+            })
+            records.append(record)
+    return records
+
+
+def python_files(paths):
+    """Lists the python files in the given paths, together with the directory
+    their module names are relative to (cf. :func:`module_name`), where a
+    directory that is itself a package counts as the top level package.
+
+    :param paths: A list of paths to python files or directories, which are
+        searched recursively.
+
+    :returns: A list of ``(path, root)`` pairs, ``root`` being ``None`` for
+        files given directly.
+    :rtype: :class:`list[tuple]`
+    """
+    files = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            files.append((path, None))
+            continue
+        root = path
+        if os.path.exists(os.path.join(path, '__init__.py')):
+            root = os.path.dirname(path)
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            files.extend((os.path.join(dirpath, filename), root)
+                         for filename in sorted(filenames)
+                         if filename.endswith('.py'))
+    return files
+
+
+def harvest(paths, errors=None):
+    """Collects all wiki sections from the python files in the given paths,
+    cf. :func:`python_files` and :func:`harvest_file`.
+
+    :param paths: A list of paths to python files or directories, which are
+        searched recursively.
+    :param errors: An optional list to which ``(path, message)`` pairs are
+        appended for files that cannot be parsed, e.g because of syntax or
+        encoding errors, which are then skipped. By default, such errors are
+        raised.
+
+    :rtype: :class:`list[dict]`
+    """
+    records = []
+    for path, root in python_files(paths):
+        try:
+            records.extend(harvest_file(path, root))
+        # UnicodeDecodeError is a ValueError, as are null bytes on python 3.
+        except (SyntaxError, ValueError) as exc:
+            if errors is None:
+                raise
+            errors.append((path, str(exc)))
+    return records
+
+
+def main(argv=None):
+    """Prints all wiki sections harvested from the given paths as JSON, and
+    the files that cannot be parsed to standard error."""
+    paths = sys.argv[1:] if argv is None else argv
+    errors = []
+    json.dump(harvest(paths, errors), sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write('\n')
+    for path, message in errors:
+        sys.stderr.write('%s: %s\n' % (path, message))
+
+
+if __name__ == '__main__':
+    main()
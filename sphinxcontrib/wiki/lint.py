@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Check wiki sections for problems without running sphinx.
+
+.. wikisection:: intro
+    :title: Linting
+
+    The ``sphinx-wiki-lint`` command reports the problems sphinx would warn
+    about for wiki sections -- sections without a title or body, duplicate
+    titles within a page, unknown parents and cycles of parents -- without
+    building anything. It scans python sources (cf.
+    :mod:`sphinxcontrib.wiki.harvest`) and reStructuredText files in the
+    given paths using a pool of processes and exits with a non-zero status if
+    there are any problems:
+
+    .. code-block:: bash
+
+        sphinx-wiki-lint --jobs 8 docs/ some_pkg/
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+
+from . import _duplicate_title, _parent_cycle
+from .harvest import docstring_sections, harvest_file
+
+_SUFFIXES = ('.py', '.rst')
+
+
+def _skip_dir(dirpath, dirname):
+    # Hidden directories and ones starting with an underscore which are not
+    # python packages, e.g the build output of sphinx in _build.
+    if dirname.startswith('.'):
+        return True
+    return dirname.startswith('_') and not os.path.exists(
+        os.path.join(dirpath, dirname, '__init__.py'))
+
+
+def source_files(paths):
+    """Lists all files in the given paths which may contain wiki sections,
+    i.e python and reStructuredText files. Directories which are hidden or
+    start with an underscore, e.g ``_build``, are not searched unless they
+    are python packages.
+
+    :param paths: A list of paths to files or directories, which are searched
+        recursively.
+
+    :rtype: :class:`list[str]`
+    """
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(dirname for dirname in dirnames
+                                 if not _skip_dir(dirpath, dirname))
+            files.extend(os.path.join(dirpath, filename)
+                         for filename in sorted(filenames)
+                         if filename.endswith(_SUFFIXES))
+    return files
+
+
+def scan_file(path):
+    """Collects all wiki sections in a python or reStructuredText file, cf.
+    :func:`sphinxcontrib.wiki.harvest.docstring_sections`.
+
+    :param path: Path to a file.
+
+    :returns: A list of dictionaries with keys ``page_name``, ``title``,
+        ``parent``, ``lines`` and ``source``.
+    :rtype: :class:`list[dict]`
+    """
+    if path.endswith('.py'):
+        return harvest_file(path)
+    with io.open(path, encoding='utf-8') as f:
+        records = docstring_sections(f.read())
+    for record in records:
+        record['source'] = '%s:%d' % (path, record['line'] + 1)
+    return records
+
+
+def _scan(path):
+    # The sections in a file and, if it cannot be parsed, the problem.
+    try:
+        return scan_file(path), []
+    # UnicodeDecodeError is a ValueError, as are null bytes on python 3.
+    except (SyntaxError, ValueError) as exc:
+        return [], [(path, 'cannot be parsed: %s' % exc)]
+
+
+def check_sections(records):
+    """Checks harvested sections for problems, cf. :func:`scan_file`.
+
+    :param records: A list of sections as returned by :func:`scan_file`.
+
+    :returns: A list of ``(source, message)`` pairs.
+    :rtype: :class:`list[tuple]`
+    """
+    problems = []
+    pages = OrderedDict()
+    for record in records:
+        if not record['title']:
+            problems.append((record['source'],
+                             'wikisection with no title'))
+            continue
+        if not record['lines']:
+            problems.append((record['source'],
+                             'wikisection "%s" has no body' % record['title']))
+        pages.setdefault(record['page_name'], []).append(record)
+
+    for page_name, sections in pages.items():
+        title = _duplicate_title(sections)
+        if title is not None:
+            problems.append(('wikipage "%s"' % page_name,
+                             'contains sections with duplicate titles "%s"' %
+                             title))
+        titles = set(sec['title'] for sec in sections)
+        for sec in sections:
+            if sec['parent'] not in titles | set(['_default_', '_none_']):
+                problems.append((sec['source'],
+                                 'wikisection "%s" references unknown ' %
+                                 sec['title'] + 'parent "%s"' % sec['parent']))
+        title = _parent_cycle(sections)
+        if title is not None:
+            problems.append(('wikipage "%s"' % page_name,
+                             'wikisection "%s" is part of a cycle of parents' %
+                             title))
+    return problems
+
+
+def lint(paths, jobs=None):
+    """Scans all files in the given paths in a pool of processes and checks
+    their wiki sections, cf. :func:`check_sections`. Files that cannot be
+    parsed are reported as problems and skipped.
+
+    :param paths: A list of paths to files or directories.
+    :param jobs: The number of processes, by default the number of CPUs.
+
+    :returns: A list of ``(source, message)`` pairs.
+    :rtype: :class:`list[tuple]`
+    """
+    files = source_files(paths)
+    if jobs == 1 or len(files) < 2:
+        results = [_scan(path) for path in files]
+    else:
+        pool = multiprocessing.Pool(jobs)
+        try:
+            results = pool.map(_scan, files)
+        finally:
+            pool.close()
+            pool.join()
+    problems = [problem for records, file_problems in results
+                for problem in file_problems]
+    return problems + check_sections([record for records, file_problems
+                                      in results for record in records])
+
+
+def main(argv=None):
+    """Entry point of ``sphinx-wiki-lint``."""
+    parser = argparse.ArgumentParser(
+        prog='sphinx-wiki-lint',
+        description='Check wiki sections for problems without running sphinx.')
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='python or reStructuredText file or directory')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of processes, defaults to number of CPUs')
+    args = parser.parse_args(argv)
+
+    problems = lint(args.paths, args.jobs)
+    for source, message in problems:
+        sys.stdout.write('%s: %s\n' % (source, message))
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
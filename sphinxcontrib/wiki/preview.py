@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Preview a single wiki page without building the whole project.
+
+.. wikisection:: intro
+    :title: Previewing a Page
+
+    While editing the sections of a wiki page, the ``sphinx-wiki-preview``
+    command gives quick feedback without a full (incremental) build:
+
+    .. code-block:: bash
+
+        sphinx-wiki-preview docs/ faq
+
+    It copies the doctree directory of the last build (by default
+    ``docs/_build/doctrees``) to a temporary directory, loads the build
+    environment pickled there, reads the documents that changed since then
+    again, assembles the given page in its host document while leaving out
+    all other pages, and writes only that document as HTML to a separate
+    directory (by default ``docs/_build/wiki-preview``). Neither the pickled
+    build environment and doctrees nor the output of regular builds are
+    modified.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from sphinx.application import Sphinx
+
+from . import wikipage
+
+
+def read_outdated(app):
+    """Reads the documents which are new or have changed since the build
+    environment was pickled, without pickling it again; their doctrees are
+    pickled to the doctree directory of the application as usual. This
+    mirrors :meth:`sphinx.environment.BuildEnvironment.update`, minus the
+    events emitted once all documents are read.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+
+    :returns: The names of documents that were read.
+    :rtype: :class:`list[str]`
+    """
+    env = app.env
+    env.find_files(app.config, app.builder)
+    added, changed, removed = env.get_outdated_files(False)
+    for docname in sorted(removed):
+        app.emit('env-purge-doc', env, docname)
+        env.clear_doc(docname)
+    docnames = sorted(added | changed)
+    for docname in docnames:
+        app.emit('env-purge-doc', env, docname)
+        env.clear_doc(docname)
+        env.read_doc(docname, app)
+    return docnames
+
+
+def preview(app, page_name, host=None):
+    """Writes the host document of a wiki page to the output directory of the
+    given application with only that page assembled, cf.
+    :func:`sphinxcontrib.wiki.doctree_resolved`. Outdated documents are read
+    first, followed by the ``env-updated`` event, as in a regular build.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`, with an HTML builder.
+    :param page_name: The name of the page.
+    :param host: The document hosting the page, by default the first one.
+
+    :returns: The path of the written file, or ``None`` if the page is not
+        hosted anywhere.
+    :rtype: :class:`str`
+    """
+    env = app.env
+    read_outdated(app)
+    app.emit('env-updated', env)
+    hosts = getattr(env, 'wikipages', {}).get(page_name)
+    if not hosts or (host is not None and host not in hosts):
+        app.warn('wikipage "%s" is not hosted in %s' %
+                 (page_name, host or 'any document'))
+        return None
+    docname = host or hosts[0]
+
+    doctree = env.get_doctree(docname)
+    for node in doctree.traverse(wikipage):
+        if node['options']['name'] != page_name:
+            node.parent.remove(node)
+    env.resolve_references(doctree, docname, app.builder)
+
+    app.builder.prepare_writing([docname])
+    if not os.path.isdir(os.path.join(app.outdir, '_static')):
+        app.builder.copy_static_files()
+    app.builder.write_doc(docname, doctree)
+    return app.builder.get_outfilename(docname)
+
+
+def main(argv=None):
+    """Entry point of ``sphinx-wiki-preview``."""
+    parser = argparse.ArgumentParser(
+        prog='sphinx-wiki-preview',
+        description='Write the HTML of a single wiki page.')
+    parser.add_argument('sourcedir', help='source directory of the project')
+    parser.add_argument('page', help='name of the wiki page')
+    parser.add_argument('-d', dest='doctreedir', default=None,
+                        help='doctree directory of the last build, defaults '
+                        'to SOURCEDIR/_build/doctrees')
+    parser.add_argument('-o', dest='outdir', default=None,
+                        help='output directory, defaults to '
+                        'SOURCEDIR/_build/wiki-preview')
+    parser.add_argument('--host', default=None,
+                        help='document hosting the page, if there are several')
+    args = parser.parse_args(argv)
+
+    srcdir = os.path.abspath(args.sourcedir)
+    doctreedir = args.doctreedir or os.path.join(srcdir, '_build', 'doctrees')
+    outdir = args.outdir or os.path.join(srcdir, '_build', 'wiki-preview')
+    # Documents read again are pickled to the doctree directory, so the
+    # preview works on a copy of it.
+    tempdir = tempfile.mkdtemp(prefix='wiki-preview-')
+    try:
+        previewdir = os.path.join(tempdir, 'doctrees')
+        if os.path.isdir(doctreedir):
+            shutil.copytree(doctreedir, previewdir)
+        app = Sphinx(srcdir, srcdir, outdir, previewdir, 'html',
+                     status=None, warning=sys.stderr)
+        # Before sphinx 1.8 the environment keeps the doctree directory it
+        # was pickled with.
+        app.env.doctreedir = previewdir
+        path = preview(app, args.page, args.host)
+    finally:
+        shutil.rmtree(tempdir, ignore_errors=True)
+    if path is None:
+        return 1
+    sys.stdout.write(path + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
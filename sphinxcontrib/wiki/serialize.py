@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Serialize docutils nodes compactly, independently of sphinx.
+
+A node is flattened to nested tuples of its class, attributes, remaining
+instance state and children, which pickle to a fraction of the size of the
+node objects themselves, cf. :func:`dump_nodes`. References to the parent and
+the document of a node are not serialized.
+
+.. wikisection:: faq
+    :title: Pickled Sections
+    :parent: Section Store
+
+    The sections stored in the build environment are pickled with it in a
+    compact form: their bodies are flattened to plain tuples and compressed,
+    which roughly halves the size of the pickle. When the build environment
+    is loaded, section bodies are only rebuilt once they are needed, i.e
+    when a page containing them is assembled, such that incremental builds
+    writing few pages load much faster. Sections that are not needed are
+    pickled again as they were loaded.
+"""
+import pickle
+import zlib
+
+from docutils import nodes
+
+# instance attributes that are either serialized separately or not at all,
+# along with private ones
+_SKIP = frozenset(['children', 'parent', 'document', 'attributes'])
+
+# node class => its key in flattened nodes, and back
+_keys = {}
+_classes = {}
+
+
+def _key(cls):
+    # The same key object for every node of a class, such that pickle only
+    # writes it once.
+    if cls not in _keys:
+        _keys[cls] = '%s.%s' % (cls.__module__, cls.__name__)
+    return _keys[cls]
+
+
+def _class(key):
+    if key not in _classes:
+        module, name = key.rsplit('.', 1)
+        _classes[key] = getattr(__import__(module, fromlist=[name]), name)
+    return _classes[key]
+
+
+def _state(node):
+    # Values of None are left to class attributes, e.g `line` and `source`,
+    # and tag names to the class, cf. unflatten().
+    state = {attr: value for attr, value in vars(node).items()
+             if attr not in _SKIP and not attr.startswith('_') and
+             value is not None}
+    if state.get('tagname') == type(node).__name__:
+        del state['tagname']
+    return state
+
+
+def _attributes(node):
+    # Empty list attributes, e.g `ids`, are restored by unflatten().
+    return {name: value for name, value in node.attributes.items()
+            if value != [] or name not in node.list_attributes}
+
+
+def flatten(node):
+    """Flattens a node and all its descendants to nested tuples, cf.
+    :func:`unflatten`. Elements become tuples of their class key, attributes,
+    instance state and children, text nodes become their text if they carry
+    no other state or a pair of their text and state otherwise.
+
+    :param node: A :class:`docutils.nodes.Node`.
+
+    :rtype: :class:`tuple` or :class:`unicode`
+    """
+    state = _state(node)
+    if isinstance(node, nodes.Text):
+        if state.get('rawsource') in ('', node):
+            del state['rawsource']
+        text = node[:]  # a plain string
+        return (text, state) if state else text
+    return (_key(type(node)), _attributes(node), state,
+            [flatten(child) for child in node.children])
+
+
+def unflatten(flat):
+    """Rebuilds a node flattened by :func:`flatten`. The rebuilt node has no
+    parent and no document.
+
+    :rtype: :class:`docutils.nodes.Node`
+    """
+    if not isinstance(flat, tuple):
+        return nodes.Text(flat)
+    if len(flat) == 2:
+        text, state = flat
+        node = nodes.Text(text)
+        node.__dict__.update(state)
+        return node
+
+    key, attributes, state, children = flat
+    cls = _class(key)
+    # Bypass __init__(), which copies attributes one by one.
+    node = cls.__new__(cls)
+    if cls.tagname is None:
+        node.tagname = cls.__name__
+    node.__dict__.update(state)
+    node.attributes = {name: [] for name in cls.list_attributes}
+    node.attributes.update(attributes)
+    node.children = [unflatten(child) for child in children]
+    for child in node.children:
+        child.parent = node
+    return node
+
+
+def dump_nodes(node_list, level=1):
+    """Serializes a list of nodes and all their descendants, i.e pickles the
+    flattened nodes (cf. :func:`flatten`) and compresses them.
+
+    :param node_list: A list of :class:`docutils.nodes.Node`.
+    :param level: The zlib compression level; low levels are much faster and
+        only slightly larger.
+
+    :rtype: :class:`bytes`
+    """
+    flat = [flatten(node) for node in node_list]
+    return zlib.compress(pickle.dumps(flat, 2), level)
+
+
+def load_nodes(data):
+    """Rebuilds a list of nodes serialized by :func:`dump_nodes`.
+
+    :rtype: :class:`list`
+    """
+    return [unflatten(flat) for flat in pickle.loads(zlib.decompress(data))]
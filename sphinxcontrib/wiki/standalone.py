@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Assemble wiki pages with plain docutils, i.e without a sphinx project.
+
+.. wikisection:: intro
+    :title: Previews without Sphinx
+
+    For a quick look at a wiki page, its sections can be collected from a set
+    of reStructuredText files and assembled with docutils alone, skipping the
+    sphinx application, build environment and builders altogether:
+
+    .. code-block:: bash
+
+        python -m sphinxcontrib.wiki.standalone wiki.rst some_pkg.rst \\
+            some_pkg.some_mod.rst > wiki.html
+
+    renders the first file with all ``wikipage`` directives in it assembled
+    from the sections found in all given files, cf. :class:`WikiStore`. Roles
+    and directives that only sphinx provides, e.g ``:func:``, are not
+    available in this mode.
+"""
+import contextlib
+import os
+import sys
+from collections import OrderedDict
+
+from docutils import nodes
+from docutils.core import publish_doctree, publish_from_doctree
+from docutils.parsers.rst import Directive, directives
+from docutils.readers import standalone
+from docutils.transforms import Transform
+
+from . import (
+    WikiPage as SphinxWikiPage,
+    WikiSection as SphinxWikiSection,
+    _duplicate_title,
+    _name_to_anchor,
+    wikipage,
+    wikipage_container,
+    wikisection,
+)
+from .tree import WikiTree
+
+
+class WikiSection(Directive):
+    """Docutils-only counterpart of :class:`sphinxcontrib.wiki.WikiSection`.
+    """
+
+    has_content = True
+    required_arguments = 1
+    optional_arguments = 0
+    option_spec = SphinxWikiSection.option_spec
+
+    def run(self):
+        title = self.options.get('title')
+        if not title:
+            return [self.state.document.reporter.warning(
+                'Ignoring wikipage section with no title.', line=self.lineno)]
+        self.assert_has_content()
+
+        sec = wikisection()
+        sec['options'] = {
+            'page_name': self.arguments[0],
+            'title': title,
+            'parent': self.options.get('parent', '_default_'),
+        }
+        sec += nodes.title(title, title)
+        self.state.nested_parse(self.content, self.content_offset, sec)
+        sec['ids'] = [_name_to_anchor(title)]
+        return [sec]
+
+
+class WikiPage(Directive):
+    """Docutils-only counterpart of :class:`sphinxcontrib.wiki.WikiPage`."""
+
+    has_content = True
+    required_arguments = 1
+    optional_arguments = 0
+    option_spec = SphinxWikiPage.option_spec
+
+    def run(self):
+        page_node = wikipage()
+        page_node['options'] = {
+            'name': self.arguments[0],
+            'title': self.options.get('title') or
+            '[' + self.arguments[0] + ']',
+        }
+        self.state.nested_parse(self.content, self.content_offset, page_node)
+        return [page_node]
+
+
+_DIRECTIVES = {'wikisection': WikiSection, 'wikipage': WikiPage}
+
+
+@contextlib.contextmanager
+def _wiki_directives():
+    # Register our directives with docutils only temporarily, such that they
+    # never shadow the ones registered by sphinx.
+    saved = {name: directives._directives.get(name) for name in _DIRECTIVES}
+    directives._directives.update(_DIRECTIVES)
+    try:
+        yield
+    finally:
+        for name, directive in saved.items():
+            if directive is None:
+                directives._directives.pop(name, None)
+            else:
+                directives._directives[name] = directive
+
+
+class CollectSections(Transform):
+    """Moves all ``wikisection`` nodes from a document to the store given in
+    the ``wiki_store`` setting, cf. :func:`sphinxcontrib.wiki.doctree_read`.
+    Runs after the reference transforms, such that references within the
+    sections are resolved in their original document."""
+
+    default_priority = 850
+
+    def apply(self):
+        store = self.document.settings.wiki_store
+        docname = self.document.settings.wiki_docname
+        for node in self.document.traverse(wikisection):
+            page_name = node['options']['page_name']
+            store.sections.setdefault(page_name, []).append({
+                'docname': docname,
+                'depth': docname.count('.') + 1,
+                'node': node.deepcopy(),
+            })
+            node.parent.remove(node)
+
+
+class Reader(standalone.Reader):
+    """A standalone reader which collects wiki sections, cf.
+    :class:`CollectSections`."""
+
+    def get_transforms(self):
+        return standalone.Reader.get_transforms(self) + [CollectSections]
+
+
+def section_container(sec_info):
+    """Builds a section corresponding to a stored ``wikisection``, cf.
+    :func:`sphinxcontrib.wiki.wikisection_container`."""
+    sec_node, docname = sec_info['node'], sec_info['docname']
+    src = nodes.subscript()
+    src += nodes.Text('[source: ')
+    src += nodes.literal(docname, docname)
+    src += nodes.Text(']')
+
+    cont = nodes.section(classes=['wikipage-section'])
+    cont += [child.deepcopy() for child in sec_node.children]
+    cont += nodes.paragraph('', '', src, classes=['section-source'])
+    cont['ids'] = list(sec_node['ids'])
+    return cont
+
+
+class AssemblePages(Transform):
+    """Replaces all ``wikipage`` nodes in a document by the sections in the
+    store given in the ``wiki_store`` setting, cf.
+    :func:`sphinxcontrib.wiki.wikipage_tree`."""
+
+    default_priority = 860
+
+    def apply(self):
+        store = self.document.settings.wiki_store
+        reporter = self.document.reporter
+        for node in self.document.traverse(wikipage):
+            page_name = node['options']['name']
+            sections = sorted(store.sections.get(page_name, []),
+                              key=lambda s: s['node']['options']['title'])
+            options = [info['node']['options'] for info in sections]
+            if not sections:
+                reporter.warning('Ignoring wikipage "%s" with no page '
+                                 'sections.' % page_name)
+                node.parent.remove(node)
+                continue
+            title = _duplicate_title(options)
+            if title is not None:
+                reporter.warning('Ignoring wikipage containing sections with '
+                                 'duplicate titles "%s"' % title)
+                node.parent.remove(node)
+                continue
+
+            tree = WikiTree([{
+                'title': opts['title'],
+                'parent': opts['parent'],
+                'depth': info['depth'],
+            } for opts, info in zip(options, sections)])
+            for idx in tree.unknown_parents:
+                reporter.warning(
+                    'wikisection "%s" references unknown parent "%s"' %
+                    (options[idx]['title'], options[idx]['parent']))
+
+            containers = [section_container(info) for info in sections]
+            for idx, children in enumerate(tree.children):
+                for child in children:
+                    containers[idx].append(containers[child])
+            sec_tree = [containers[idx] for idx in tree.roots]
+            node.replace_self(wikipage_container(None, sec_tree, node))
+
+
+class WikiStore(object):
+    """An in-memory store of wiki sections, the docutils-only counterpart of
+    ``env.wikisections`` (cf. :func:`sphinxcontrib.wiki.doctree_read`). Like
+    sphinx, documents are named after their file names without extension
+    which determines the place of their sections in the section hierarchy.
+
+    :param settings_overrides: Optional docutils settings.
+    """
+
+    def __init__(self, settings_overrides=None):
+        self.settings_overrides = dict(settings_overrides or {})
+        self.sections = {}
+        self.doctrees = OrderedDict()
+
+    def read(self, path):
+        """Parses a file, collecting its wiki sections.
+
+        :param path: Path to a reStructuredText file.
+
+        :returns: The doctree of the file, without its wiki sections.
+        :rtype: :class:`docutils.nodes.document`
+        """
+        docname = os.path.splitext(os.path.basename(path))[0]
+        settings = dict(self.settings_overrides,
+                        wiki_store=self, wiki_docname=docname)
+        with open(path, 'rb') as f:
+            source = f.read()
+        with _wiki_directives():
+            doctree = publish_doctree(source, source_path=path,
+                                      reader=Reader(),
+                                      settings_overrides=settings)
+        self.doctrees[path] = doctree
+        return doctree
+
+    def render(self, path, writer_name='html'):
+        """Renders a previously read file with all its wiki pages assembled,
+        cf. :class:`AssemblePages`.
+
+        :param path: Path to a file passed to :meth:`read`.
+        :param writer_name: The name of a docutils writer.
+
+        :returns: The encoded output of the writer.
+        :rtype: :class:`bytes`
+        """
+        doctree = self.doctrees[path].deepcopy()
+        AssemblePages(doctree).apply()
+        return publish_from_doctree(doctree, writer_name=writer_name,
+                                    settings_overrides=self.settings_overrides)
+
+
+def main(argv=None):
+    """Renders the first of the given files with wiki sections collected from
+    all of them to standard output, cf. :class:`WikiStore`."""
+    paths = sys.argv[1:] if argv is None else argv
+    store = WikiStore()
+    for path in paths:
+        store.read(path)
+    output = store.render(paths[0])
+    getattr(sys.stdout, 'buffer', sys.stdout).write(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Place the sections of a wiki page in a tree, independently of sphinx.
+"""
+
+
+class WikiTree(object):
+    """The tree structure of the sections of one wiki page, as used by
+    :func:`sphinxcontrib.wiki.wikipage_tree`. Sections are given as records,
+    i.e dictionaries with keys:
+
+    - ``title``: the title of the section, unique within the page.
+    - ``parent``: the ``:parent:`` option of the section, one of
+      ``_default_``, ``_none_`` or the title of another section.
+    - ``depth``: the depth of the section in the module hierarchy, cf.
+      :func:`sphinxcontrib.wiki.doctree_read`.
+
+    Sections with a default parent are placed in the given order, each under
+    the last section seen so far with a smaller depth (the closest depth
+    first), or at the top level if there is none. Afterwards, sections forcing
+    their parent to ``_none_`` are appended to the top level and those forcing
+    another section as their parent are appended to the children of that
+    section. Sections referencing an unknown parent are treated as if they had
+    a default parent.
+
+    :param records: A list of section records.
+
+    Once constructed, the following attributes describe the tree in terms of
+    indices into ``records``:
+
+    :ivar roots: The top level sections, in order.
+    :ivar children: A list containing the children of each section, in order.
+    :ivar unknown_parents: The sections referencing an unknown parent.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.roots = []
+        self.children = [[] for record in records]
+        self.unknown_parents = []
+        self._place()
+
+    def _place(self):
+        idx_by_title = {
+            record['title']: idx for idx, record in enumerate(self.records)
+        }
+        # (wikisection index, index of parent or None), in order
+        forced = []
+        # wikisection depth (int) => index of the last wikisection seen
+        last_of_depth = {}
+
+        for idx, record in enumerate(self.records):
+            parent = record['parent']
+            if parent != '_default_':
+                if parent == '_none_':
+                    forced.append((idx, None))
+                    continue
+                if parent in idx_by_title:
+                    forced.append((idx, idx_by_title[parent]))
+                    continue
+                self.unknown_parents.append(idx)
+
+            depth = record['depth']
+            last_of_depth[depth] = idx
+            parent_depth = depth - 1
+            while parent_depth not in last_of_depth and parent_depth > 0:
+                parent_depth -= 1
+            if parent_depth <= 0:
+                self.roots.append(idx)
+            else:
+                self.children[last_of_depth[parent_depth]].append(idx)
+
+        for child, parent in forced:
+            if parent is None:
+                self.roots.append(child)
+        for child, parent in forced:
+            if parent is not None:
+                self.children[parent].append(child)
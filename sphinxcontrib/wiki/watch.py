@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Rewrite the hosts of wiki pages whose sections change, as they change.
+
+.. wikisection:: intro
+    :title: Watching for Changes
+
+    When serving the HTML output of a project locally, e.g while writing, the
+    ``sphinx-wiki-watch`` command keeps the wiki pages in it up to date:
+
+    .. code-block:: bash
+
+        sphinx-wiki-watch docs/
+
+    After loading the build environment pickled by the last build (by default
+    from ``docs/_build/doctrees``) it polls the sources of the project,
+    including python modules documented by autodoc or listed in
+    ``wiki_harvest_paths``. Whenever some of them change, only the changed
+    documents are read again and only they and the hosts of the wiki pages
+    whose sections changed are written (by default to ``docs/_build/html``).
+    The pickled build environment is not updated; the next regular build
+    reads the changed documents again.
+"""
+import argparse
+import os
+import sys
+import time
+
+from sphinx.application import Sphinx
+
+from .harvest import python_files
+from .preview import read_outdated
+
+
+def _page_docs(env):
+    # page name => names of documents containing its sections
+    return {name: set(sec['docname'] for sec in sections)
+            for name, sections in getattr(env, 'wikisections', {}).items()}
+
+
+def harvest_mtimes(app):
+    """Returns the modification times of the python files listed in
+    ``wiki_harvest_paths``, cf. :func:`sphinxcontrib.wiki.harvest_sections`.
+
+    :rtype: :class:`dict`
+    """
+    paths = [os.path.join(app.confdir, path)
+             for path in app.config['wiki_harvest_paths']]
+    return {path: os.path.getmtime(path) for path, root in python_files(paths)}
+
+
+def write_docs(app, docnames):
+    """Writes the given documents with the builder of the application, cf.
+    :meth:`sphinx.builders.Builder.write`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param docnames: A list of document names.
+    """
+    builder = app.builder
+    builder.prepare_writing(docnames)
+    for docname in docnames:
+        doctree = app.env.get_and_resolve_doctree(docname, builder)
+        builder.write_doc_serialized(docname, doctree)
+        builder.write_doc(docname, doctree)
+
+
+def update(app, mtimes):
+    """Reads the documents which changed since the last update and writes
+    them along with the hosts of all wiki pages whose sections changed.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param mtimes: The modification times of harvested python files at the
+        time of the last update, cf. :func:`harvest_mtimes`.
+
+    :returns: The names of the written documents and the current modification
+        times of harvested python files.
+    :rtype: :class:`tuple`
+    """
+    env = app.env
+    before = _page_docs(env)
+    docnames = set(read_outdated(app))
+    current = harvest_mtimes(app)
+    if not docnames and current == mtimes:
+        return [], current
+
+    # Collects harvested sections, amongst others, cf. env_updated(). The
+    # section store belongs to the pickled build environment, which is not
+    # updated, so sections read again are kept in memory instead.
+    section_store = app.config.wiki_section_store
+    app.config.wiki_section_store = False
+    try:
+        for retval in app.emit('env-updated', env):
+            if retval is not None:
+                docnames.update(retval)
+    finally:
+        app.config.wiki_section_store = section_store
+    pages = set(name for name, docs in
+                list(before.items()) + list(_page_docs(env).items())
+                if docs & docnames)
+    for name in pages:
+        docnames.update(env.wikipages.get(name, []))
+
+    docnames = sorted(docnames & env.found_docs)
+    write_docs(app, docnames)
+    return docnames, current
+
+
+def watch(app, interval=1.0):
+    """Polls the sources of the project for changes forever, cf.
+    :func:`update`.
+
+    :param app: The "application", instance of
+        :class:`sphinx.application.Sphinx`.
+    :param interval: The number of seconds between two polls.
+    """
+    mtimes = harvest_mtimes(app)
+    while True:
+        time.sleep(interval)
+        docnames, mtimes = update(app, mtimes)
+        if docnames:
+            app.info('wrote %s' % ', '.join(docnames))
+
+
+def main(argv=None):
+    """Entry point of ``sphinx-wiki-watch``."""
+    parser = argparse.ArgumentParser(
+        prog='sphinx-wiki-watch',
+        description='Rewrite wiki pages as their sections change.')
+    parser.add_argument('sourcedir', help='source directory of the project')
+    parser.add_argument('-d', dest='doctreedir', default=None,
+                        help='doctree directory of the last build, defaults '
+                        'to SOURCEDIR/_build/doctrees')
+    parser.add_argument('-o', dest='outdir', default=None,
+                        help='output directory of the last build, defaults '
+                        'to SOURCEDIR/_build/html')
+    parser.add_argument('-i', dest='interval', type=float, default=1.0,
+                        help='seconds between polls, defaults to 1')
+    args = parser.parse_args(argv)
+
+    srcdir = os.path.abspath(args.sourcedir)
+    doctreedir = args.doctreedir or os.path.join(srcdir, '_build', 'doctrees')
+    outdir = args.outdir or os.path.join(srcdir, '_build', 'html')
+    app = Sphinx(srcdir, srcdir, outdir, doctreedir, 'html',
+                 status=sys.stdout, warning=sys.stderr)
+    try:
+        watch(app, args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import os.path
+import time
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def overview_anchors(app):
+    soup = get_html_soup(app, 'index.html')
+    return [p.parent['id'] for p in soup.findAll('p') if
+            p.text.endswith('page overview.')]
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    # NOTE the anchors are saved upon ``build-finished`` which is only emitted
+    # by the application, not by the builder.
+    app.build(force_all=True)
+
+    soup = get_html_soup(app, 'index.html')
+    ids = [tag['id'] for tag in soup.findAll(id=True)]
+    assert len(ids) == len(set(ids)), 'There must be no duplicate ids'
+
+    assert overview_anchors(app) == ['overview-2', 'overview-3'], \
+        'Colliding section anchors must be made unique'
+
+    # Remove the first of the colliding sections.
+    index = os.path.join(app.srcdir, 'index.rst')
+    with open(index, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    start = lines.index('.. wikisection:: first')
+    del lines[start:start + 5]
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    mtime = time.time() + 10
+    os.utime(index, (mtime, mtime))
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        assert overview_anchors(app2) == ['overview-3'], \
+            'Section anchors must be stable across builds'
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
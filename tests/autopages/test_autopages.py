@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import os.path
+import time
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    assert sorted(app.env.wikiautodocs) == ['wiki/alpha'], \
+        'Only pages without a host must get a generated document'
+    assert 'Dropping sections' not in warning.getvalue()
+    assert 'toctree' not in warning.getvalue()
+
+    soup = get_html_soup(app, 'wiki/alpha.html')
+    page = soup.find(id='alpha')
+    assert page.find('h1').text.rstrip(u'\xb6') == 'alpha'
+    assert page.find(id='alpha-section').find(
+        'a', {'href': '../index.html#some_func'}), \
+        'References must be resolved relative to the generated document'
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find(id='beta-section') and not soup.find(id='alpha-section')
+
+    # Host the page by hand.
+    index_rst = os.path.join(app.srcdir, 'index.rst')
+    with open(index_rst, 'a', encoding='utf-8') as f:
+        f.write(u'\n.. wikipage:: alpha\n   :title: Alpha Page\n')
+    mtime = time.time() + 10
+    os.utime(index_rst, (mtime, mtime))
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        assert not app2.env.wikiautodocs
+        assert not os.path.exists(
+            os.path.join(app.srcdir, 'wiki', 'alpha.rst')), \
+            'Generated documents no longer needed must be removed'
+        soup = get_html_soup(app2, 'index.html')
+        assert soup.find(id='alpha-section')
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True,
+          confoverrides={'wiki_autopages': False})
+def test_build_html_user_autopage(app, status, warning):
+    mine_rst = os.path.join(app.srcdir, 'mine.rst')
+    with open(mine_rst, 'w', encoding='utf-8') as f:
+        f.write(u':orphan:\n\n.. wikipage:: alpha\n'
+                u'   :title: Alpha Page\n   :autopage:\n')
+    app.build(force_all=True)
+    assert os.path.exists(mine_rst)
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        assert os.path.exists(mine_rst), \
+            'Documents of the user must never be removed'
+        assert not app2.env.wikiautodocs, \
+            'Documents of the user must host their pages'
+        soup = get_html_soup(app2, 'mine.html')
+        assert soup.find(id='alpha-section')
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='latex', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_html_user_autopage()
+    test_build_latex()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import os.path
+
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'index.html'))
+
+    soup = get_html_soup(app, 'index.html')
+    section = soup.find(id='section-title')
+    assert section, 'Sections with deferred bodies must be assembled'
+    assert section.find(text='Deferred body referencing '), \
+        'Deferred section bodies must be parsed upon assembly'
+    assert section.find('a', {'href': '#some_func'}), \
+        'References in deferred section bodies must be resolved'
+
+    assert soup.find('a', {'href': '#helper', 'class': 'reference'}), \
+        'Objects defined in section bodies must be registered when read'
+    genindex = get_html_soup(app, 'genindex.html')
+    assert genindex.find('a', {'href': 'index.html#helper'}), \
+        'Objects defined in section bodies must be indexed'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import os.path
+import pickle
+import time
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def _sections_size(env):
+    return len(pickle.dumps(env.wikisections, pickle.HIGHEST_PROTOCOL))
+
+
+def _pickled_env(app):
+    with open(os.path.join(app.doctreedir, 'environment.pickle'), 'rb') as f:
+        return pickle.load(f)
+
+
+def _env_size(app):
+    return os.path.getsize(os.path.join(app.doctreedir, 'environment.pickle'))
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    env = _pickled_env(app)
+    sec_info, = env.wikisections['wiki']
+    assert sec_info['line'] == 5, \
+        'The line of a section in its document must be kept'
+    for node in sec_info['node'].traverse():
+        assert node.document is None and node.source is None, \
+            'Stored sections must be detached from their document'
+
+    # Content outside of sections does not end up in the environment.
+    sections_size, env_size = _sections_size(env), _env_size(app)
+    path = os.path.join(app.srcdir, 'sections.rst')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(u'\nMore filler.\n' * 2000)
+    mtime = time.time() + 10
+    os.utime(path, (mtime, mtime))
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+    finally:
+        app2.cleanup()
+    assert abs(_sections_size(_pickled_env(app)) - sections_size) < 100
+    assert _env_size(app) - env_size < 1000, \
+        'Stored sections must not drag their document into the environment'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import json
+import os.path
+import time
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def _edit(app, docname, old, new):
+    path = os.path.join(app.srcdir, docname + '.rst')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source.replace(old, new))
+    mtime = time.time() + 10
+    os.utime(path, (mtime, mtime))
+
+
+def _rebuild(app):
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+    finally:
+        app2.cleanup()
+
+
+def _report(app):
+    with open(os.path.join(app.outdir, 'wikidiff.json')) as f:
+        diff = json.load(f)
+    return {key: sorted(entry['title'] for entry in entries)
+            for key, entries in diff.items()}
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    assert _report(app) == {
+        'added': ['Alpha', 'Beta', 'Delta', 'Gamma'],
+        'removed': [], 'moved': [], 'edited': [],
+    }, 'The first build must report all sections as added'
+
+    _edit(app, 'host', 'Beta body.', 'Edited beta body.')
+    _edit(app, 'sections', ':parent: Alpha', ':parent: Beta')
+    _edit(app, 'sections', 'Delta', 'Epsilon')
+    _rebuild(app)
+    assert _report(app) == {
+        'added': ['Epsilon'],
+        'removed': ['Delta'],
+        'moved': ['Gamma'],
+        'edited': ['Beta'],
+    }, 'Changed sections must be reported by kind'
+    with open(os.path.join(app.outdir, 'wikidiff.json')) as f:
+        moved = json.load(f)['moved'][0]
+    assert (moved['old_parent'], moved['new_parent']) == ('Alpha', 'Beta')
+
+    _rebuild(app)
+    assert not any(_report(app).values()), \
+        'Unchanged sections must not be reported'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import os.path
+import time
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def _edit(app, docname, old, new):
+    path = os.path.join(app.srcdir, docname + '.rst')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source.replace(old, new))
+    _touch(path, time.time() + 10)
+
+
+def _touch(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+def _rebuild(app):
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    host_html = os.path.join(app.outdir, 'host.html')
+    assert app.env.wikitargets['host'] == ['sections', 'targets']
+
+    # An unrelated change leaves the host alone.
+    _touch(host_html, 1000)
+    _edit(app, 'other', 'Unrelated', 'Edited unrelated')
+    _rebuild(app)
+    assert os.path.getmtime(host_html) == 1000, \
+        'Hosts of unchanged pages must not be written'
+
+    # Sections changing in other documents outdate the host.
+    _edit(app, 'sections', 'Original', 'Edited')
+    _rebuild(app)
+    assert os.path.getmtime(host_html) != 1000
+    soup = get_html_soup(app, 'host.html')
+    assert 'Edited body' in soup.find(id='section-title').text, \
+        'Hosts of changed pages must be written'
+
+    # So do reference targets going away.
+    _touch(host_html, 1000)
+    _edit(app, 'targets', 'some_func', 'other_func')
+    _rebuild(app)
+    assert os.path.getmtime(host_html) != 1000, \
+        'Hosts referencing documents read again must be written'
+    soup = get_html_soup(app, 'host.html')
+    assert not soup.find(id='section-title').find(
+        'a', {'href': 'targets.html#some_func'})
+
+    # Hosts written with unchanged contents keep their modification time.
+    _touch(host_html, 1000)
+    _touch(os.path.join(app.srcdir, 'host.rst'), time.time() + 20)
+    _rebuild(app)
+    assert os.path.getmtime(host_html) == 1000, \
+        'Unchanged output must keep its modification time'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import os.path
+
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    app.builder.build_all()
+
+    assert list(app.env.wikisections) == ['wiki'], \
+        'Only sections of included pages must be collected'
+    assert [sec['docname'] for sec in app.env.wikisections['wiki']] == \
+        ['index'], 'Only sections of included documents must be collected'
+
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find(id='kept-section'), \
+        'Sections of included pages must be assembled'
+    for title in ['Excluded Page', 'Excluded Section', 'Other Page',
+                  'Other Section']:
+        assert title not in soup.text, \
+            'Excluded pages and their sections must be left out'
+    assert 'Unharvested' not in get_html_soup(app, 'other.html').text, \
+        'Sections that are not collected must be removed'
+    assert 'no page sections' not in warning.getvalue(), \
+        'Excluded pages must be left out silently'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+from bs4 import BeautifulSoup
+import os.path
+import posixpath
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    soup = get_html_soup(app, 'sub/host.html')
+
+    sec = soup.find(id='long-section')
+    assert 'First paragraph.' in sec.text
+    assert 'Second paragraph' not in sec.text, \
+        'Section bodies must be moved out of the page'
+    links = [a['href'] for a in soup.find_all('a', class_='wikipage-lazy-toggle')]
+    assert links == ['../_wiki/sub/host-1.html', '../_wiki/sub/host-2.html'], \
+        'Only sections with more than a paragraph have lazy bodies'
+    assert sec.find(id='child-section').find(class_='wikipage-lazy'), \
+        'Subsections must be kept in the page'
+    assert 'Child second paragraph' not in sec.text
+    assert sec.find(class_='section-source'), \
+        'Source citations must be kept in the page'
+    assert 'Only paragraph.' in soup.find(id='short-section').text
+    assert soup.find('script', src='../_static/wikilazy.js')
+    assert os.path.exists(os.path.join(app.outdir, '_static', 'wikilazy.js'))
+
+    path = os.path.join(app.outdir, '_wiki', 'sub', 'host-1.html')
+    with open(path, encoding='utf-8') as f:
+        fragment = BeautifulSoup(f.read(), 'html.parser')
+    assert 'Second paragraph' in fragment.text and 'third' in fragment.text
+    assert fragment.find('a', {'href': '../index.html#some_func'}), \
+        'Fragments must keep references relative to their page'
+    assert fragment.find('meta', charset='utf-8')
+    base = fragment.find('base')['href']
+    assert base == '../../sub/host.html', \
+        'Fragments opened on their own must resolve links like their page'
+    assert posixpath.normpath(posixpath.join(
+        '_wiki/sub', posixpath.dirname(base), '../index.html')) == \
+        'index.html'
+    assert 'First paragraph' not in fragment.text
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html_nested(app, status, warning):
+    app.build(force_all=True)
+    soup = get_html_soup(app, 'sub.html')
+    links = [a['href'] for a in soup.find_all('a', class_='wikipage-lazy-toggle')]
+    assert links == ['_wiki/sub-1.html']
+
+    app.builder.build_specific([os.path.join(app.srcdir, 'sub.rst')])
+    for name in ('sub-1.html', os.path.join('sub', 'host-1.html')):
+        assert os.path.exists(os.path.join(app.outdir, '_wiki', name)), \
+            'Writing a page must keep the fragments of nested pages'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    with open(os.path.join(app.outdir, 'pkg.tex'), encoding='utf-8') as f:
+        assert 'Second paragraph' in f.read(), \
+            'Other builders must keep section bodies'
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_html_nested()
+    test_build_latex()
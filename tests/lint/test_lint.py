@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import os.path
+import shutil
+import tempfile
+
+from sphinxcontrib.wiki import lint
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def test_lint():
+    problems = lint.lint([srcdir], jobs=2)
+    index = os.path.join(srcdir, 'index.rst')
+    other = os.path.join(srcdir, 'other.rst')
+    assert sorted(problems) == sorted([
+        ('%s:24' % index, 'wikisection "Fourth" references unknown parent ' +
+         '"Fifth"'),
+        ('wikipage "wiki"', 'wikisection "Second" is part of a cycle of ' +
+         'parents'),
+        ('%s:5' % other, 'wikisection with no title'),
+        ('%s:9' % other, 'wikisection "Other" has no body'),
+        ('wikipage "other"', 'contains sections with duplicate titles ' +
+         '"Other"'),
+    ]), 'All problems with wiki sections must be reported'
+
+    assert lint.main([srcdir, '--jobs', '1']) == 1, \
+        'Problems must be reflected in the exit status'
+    assert lint.main([os.path.join(this_dir, 'test_lint.py')]) == 0, \
+        'There must be no problems in files without wiki sections'
+
+
+def test_lint_files():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        docs = os.path.join(tmpdir, 'docs')
+        sources = os.path.join(docs, '_build', 'html', '_sources')
+        shutil.copytree(srcdir, docs)
+        shutil.copytree(srcdir, sources)
+        for name in os.listdir(sources):
+            if name.endswith('.rst'):
+                os.rename(os.path.join(sources, name),
+                          os.path.join(sources, name + '.txt'))
+        shutil.copytree(srcdir, os.path.join(docs, '.hidden'))
+        with open(os.path.join(docs, 'syntax.py'), 'wb') as f:
+            f.write(b'def broken(:\n    pass\n')
+        with open(os.path.join(docs, 'latin1.rst'), 'wb') as f:
+            f.write(b'Caf\xe9\n')
+
+        problems = lint.lint([docs], jobs=1)
+        assert not [source for source, message in problems
+                    if '_build' in source or '.hidden' in source], \
+            'Build output and hidden directories must not be scanned'
+        assert sorted(os.path.basename(source) for source, message in problems
+                      if 'cannot be parsed' in message) == \
+            ['latin1.rst', 'syntax.py'], \
+            'Files that cannot be parsed must be reported as problems'
+        assert len(problems) == 7, \
+            'Files that cannot be parsed must not stop the scan'
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    app.builder.build_all()
+    assert 'WARNING: wikisection "Second" is part of a cycle of parents' \
+        in warning.getvalue(), 'Cycles of parents must issue a warning'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_lint()
+    test_lint_files()
+    test_build_html()
+    test_build_latex()
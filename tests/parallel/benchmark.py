@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Times the assembly of a single large wiki page, serially and in forked
+processes, cf. ``wiki_parallel_jobs``, with section bodies parsed when read
+and when the page is assembled, cf. ``wiki_deferred_parse``::
+
+    python -m tests.parallel.benchmark [SECTIONS [JOBS...]]
+
+The writing phase, i.e from ``env-updated`` to ``build-finished``, is timed
+as a whole and so is the part of it spent assembling pages and resolving
+their references, i.e in :func:`sphinxcontrib.wiki.doctree_resolved`.
+"""
+from sphinx.application import Sphinx
+import functools
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from sphinxcontrib import wiki
+
+_CONF = u"""
+extensions = ['sphinxcontrib.wiki']
+master_doc = 'index'
+wiki_enabled = True
+wiki_parallel_threshold = 1
+"""
+
+_SECTION = u"""
+.. wikisection:: big
+   :title: Section {idx}
+
+   Body of section {idx} referencing :func:`func_{ref}` and
+   :func:`.func_{other}`, with *some* ``inline`` markup.
+
+   - an item
+   - another item referencing :func:`func_{idx}`
+"""
+
+
+def make_project(path, count):
+    with io.open(os.path.join(path, 'conf.py'), 'w') as f:
+        f.write(_CONF)
+    with io.open(os.path.join(path, 'index.rst'), 'w') as f:
+        f.write(u'=====\nIndex\n=====\n\n')
+        for idx in range(count):
+            f.write(u'.. py:function:: func_%d()\n\n' % idx)
+        for idx in range(count):
+            f.write(_SECTION.format(idx=idx, ref=(idx * 7) % count,
+                                    other=(idx * 13) % count))
+        f.write(u'\n.. wikipage:: big\n   :title: Big Page\n')
+
+
+def _timed(times, func):
+    @functools.wraps(func)
+    def wrapper(*args):
+        start = time.time()
+        try:
+            return func(*args)
+        finally:
+            times['assemble'] = times.get('assemble', 0) + \
+                time.time() - start
+    return wrapper
+
+
+def time_build(srcdir, jobs, deferred):
+    """Builds the project with the given number of processes and returns the
+    times spent writing and assembling pages."""
+    builddir = tempfile.mkdtemp()
+    times = {}
+    original = wiki.doctree_resolved
+    # connected by setup(), cf. Sphinx()
+    wiki.doctree_resolved = _timed(times, original)
+    try:
+        app = Sphinx(srcdir, srcdir, os.path.join(builddir, 'html'),
+                     os.path.join(builddir, 'doctrees'), 'html',
+                     confoverrides={'wiki_parallel_jobs': jobs,
+                                    'wiki_deferred_parse': deferred},
+                     status=None, warning=None, freshenv=True)
+
+        def read(app, env):
+            times['read'] = time.time()
+
+        def done(app, exception):
+            times['done'] = time.time()
+
+        app.connect('env-updated', read)
+        app.connect('build-finished', done)
+        app.build()
+    finally:
+        wiki.doctree_resolved = original
+        shutil.rmtree(builddir)
+    return times['done'] - times['read'], times['assemble']
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 2000
+    jobs = [int(arg) for arg in argv[1:]] or [1, 2, 4]
+    srcdir = tempfile.mkdtemp()
+    try:
+        make_project(srcdir, count)
+        for deferred in [False, True]:
+            for job in jobs:
+                write, assemble = min(time_build(srcdir, job, deferred)
+                                      for _ in range(3))
+                mode = 'deferred' if deferred else 'parsed'
+                sys.stdout.write('%6d sections, %-8s %2d jobs: write %6.2fs, '
+                                 'assemble %6.2fs\n' % (count, mode, job,
+                                                        write, assemble))
+    finally:
+        shutil.rmtree(srcdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import json
+import os.path
+
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    soup = get_html_soup(app, 'index.html')
+
+    page = soup.find(id='big')
+    titles = [h.text.rstrip(u'\xb6') for h in page.find_all('h3')]
+    assert titles == ['Big Section %d' % i for i in range(6)], \
+        'Sections assembled in parallel must be merged in order'
+    assert page.find(id='big-section-4').find(id='big-child'), \
+        'Subtrees must be assembled as a whole'
+    for i in range(6):
+        sec = page.find(id='big-section-%d' % i)
+        assert sec.find('a', {'href': '#some_func'}) and \
+            sec.find('a', {'href': '#other_func'}), \
+            'References must be resolved in parallel'
+    assert soup.find(id='small-section').find('a', {'href': '#some_func'})
+
+    keys = set(key[2] for key in app.env.wikixrefs)
+    assert keys == set(['some_func', 'other_func']), \
+        'References cached by forked processes must be merged'
+
+    with open(os.path.join(app.outdir, 'unresolved.json')) as f:
+        report = json.load(f)
+    assert [entry['target'] for entry in report] == ['missing_func'], \
+        'Unresolved references must be reported from forked processes'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+from docutils import nodes
+from sphinx import addnodes
+import os.path
+
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+
+    assert sorted(app.env.wikitrees) == ['dup', 'wiki'], \
+        'All hosted pages must be assembled before writing'
+    assert app.env.wikitrees['dup'] is None
+    tree = app.env.wikitrees['wiki']
+    assert [cont[0].astext() for cont in tree] == \
+        ['Other Section', 'Section Title']
+    assert any(True for node in tree[1].traverse(addnodes.pending_xref)), \
+        'Hosts must resolve references in their own copy of the tree'
+    assert not any(cont['ids'] != [nodes.make_id(cont[0].astext())]
+                   for cont in tree)
+
+    assert warning.getvalue().count('duplicate titles') == 1, \
+        'Pages must be checked once, not once per host'
+
+    for page in ['index.html', 'other.html']:
+        soup = get_html_soup(app, page)
+        sec = soup.find(id='section-title')
+        assert sec.find('a', {'href': 'index.html#some_func'}) or \
+            sec.find('a', {'href': '#some_func'}), \
+            'Each host must resolve references of the shared tree'
+        assert soup.find(id='other-section')
+        assert soup.find('h1', text='Duplicate Page') is None
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import os.path
+import time
+
+from sphinxcontrib.wiki import preview
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def snapshot(path):
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                files[path] = (os.path.getmtime(path), f.read())
+    return files
+
+
+def read_html(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+
+    sections = os.path.join(app.srcdir, 'sections.rst')
+    with open(sections, encoding='utf-8') as f:
+        source = f.read()
+    with open(sections, 'w', encoding='utf-8') as f:
+        f.write(source.replace('Original', 'Edited'))
+    mtime = time.time() + 10
+    os.utime(sections, (mtime, mtime))
+
+    outdir = os.path.join(app.builddir, 'preview')
+    doctrees = snapshot(app.doctreedir)
+    assert preview.main([app.srcdir, 'wiki', '-d', app.doctreedir,
+                         '-o', outdir]) == 0
+    html = read_html(os.path.join(outdir, 'index.html'))
+    assert 'Edited section body.' in html, \
+        'Previews must reflect changes since the last build'
+    assert 'Other Page' not in html, \
+        'Previews must leave out all other pages'
+    assert not os.path.exists(os.path.join(outdir, 'sections.html')), \
+        'Previews must only write the host of the page'
+    assert 'Original section body.' in \
+        get_html_soup(app, 'index.html').text, \
+        'Previews must not modify the output of the build'
+    assert snapshot(app.doctreedir) == doctrees, \
+        'Previews must not modify the doctrees of the build'
+
+    assert preview.main([app.srcdir, 'nowhere', '-d', app.doctreedir,
+                         '-o', outdir]) == 1, \
+        'Previews of pages that are not hosted must fail'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -38,19 +38,60 @@ def test_build_html(app, status, warning):
         'href': 'some_pkg.some_mod.html#some_pkg.some_mod.mod_func'
     })
     assert extref, 'References to other documents should work.'
+    assert app.env.wikisuffixes['some_mod.mod_func'] == \
+        ['some_pkg.some_mod.mod_func'], \
+        'Python object names must be tabled once for refspecific references'
+    assert app.env.wikiuris['some_pkg.some_mod.html'] == \
+        'some_pkg.some_mod', 'Document URIs must be listed once per build'
 
     page_body = body.find('p', text='FAQ page body.')
     assert page_body, 'Wiki page bodies should not be lost'
 
 
 
+@with_app(buildername='html', srcdir=srcdir)
+def test_prescan(app, status, warning):
+    app.builder.build_all()
+    assert app.env.wikidocs == set([
+        'index', 'twice', 'some_pkg', 'some_pkg.some_mod',
+        'some_pkg.other_mod',
+    ]), 'Only documents with wiki directives or docstrings must be scanned'
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_sources(app, status, warning):
+    app.builder.build_all()
+    sections = dict((sec['node']['options']['title'], sec)
+                    for sec in app.env.wikisections['twice'] +
+                    app.env.wikisections['faq'])
+    module = os.path.join(this_dir, 'some_pkg', 'some_mod.py')
+    for title, line in [('Why not?', 1), ('Twice', 6)]:
+        assert sections[title]['source'] == \
+            module + ':docstring of some_pkg.some_mod', \
+            'Sections from docstrings must keep their original source'
+        assert sections[title]['line'] == line
+
+
 @with_app(buildername='latex', srcdir=srcdir)
 def test_build_latex(app, status, warning):
     app.builder.build_all()
     assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
 
 
+@with_app(buildername='latex', srcdir=srcdir, confoverrides={
+    'latex_documents': [('book', 'book.tex', u'Book', u'Author', 'manual')],
+})
+def test_build_latex_hosts(app, status, warning):
+    app.builder.build_all()
+    with open(os.path.join(app.outdir, 'book.tex')) as f:
+        assert 'Twice with a link' in f.read(), \
+            'Pages hosted outside the start document must be assembled'
+
+
 # for print debugging:
 if __name__ == '__main__':
     test_build_html()
+    test_prescan()
+    test_sources()
     test_build_latex()
+    test_build_latex_hosts()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import gzip
+import json
+import os.path
+
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    # NOTE the index is written upon ``build-finished`` which is only emitted
+    # by the application, not by the builder.
+    app.build(force_all=True)
+    assert os.path.exists(os.path.join(app.outdir, 'index.html'))
+
+    path = os.path.join(app.outdir, '_static', 'wikisearch.json.gz')
+    assert os.path.exists(path), 'The section search index must be written'
+    with gzip.open(path) as f:
+        index = json.loads(f.read().decode('utf-8'))
+    plain_path = os.path.join(app.outdir, '_static', 'wikisearch.json')
+    with open(plain_path, 'rb') as f:
+        assert json.loads(f.read().decode('utf-8')) == index, \
+            'An uncompressed index must be written for older browsers'
+
+    sections = [tuple(sec) for sec in index['sections']]
+    assert ('Section Title', 'index.html#section-title') in sections, \
+        'Search results must point to section anchors'
+
+    dragons = [index['sections'][idx][0] for idx in index['terms']['dragons']]
+    assert dragons == ['Another Section'], \
+        'Section bodies must be indexed'
+
+    assert os.path.exists(os.path.join(app.outdir, '_static', 'wikisearch.js'))
+
+    soup = get_html_soup(app, 'search.html')
+    assert soup.find('script', src='_static/wikisearch.js'), \
+        'The search page must load the section search script'
+
+    soup = get_html_soup(app, 'index.html')
+    assert not soup.find('script', src='_static/wikisearch.js'), \
+        'Only the search page should load the section search script'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+from docutils import nodes
+from docutils.core import publish_doctree
+
+from sphinxcontrib.wiki import wikisection
+from sphinxcontrib.wiki.serialize import dump_nodes, load_nodes
+
+source = u"""
+Some *emphasized* text with ``literal`` words and a `link
+<http://example.com/>`_.
+
+- a list item
+- another item with **strong** text
+
+::
+
+    def func(x):
+        return x
+"""
+
+
+def section(title):
+    sec = wikisection()
+    sec['options'] = {'page_name': 'wiki', 'title': title,
+                      'parent': '_default_'}
+    sec['ids'] = [title.lower()]
+    sec += nodes.title(title, title)
+    doctree = publish_doctree(source, settings_overrides={'report_level': 5})
+    sec += [child.deepcopy() for child in doctree.children]
+    return sec
+
+
+def native_size(sections):
+    # the size of the given sections pickled as plain docutils sections
+    plain = []
+    for sec in sections:
+        node = nodes.section(sec.rawsource, **sec.attributes)
+        node.extend(child.deepcopy() for child in sec.children)
+        plain.append(node)
+    return len(pickle.dumps(plain, 2))
+
+
+def test_round_trip():
+    sec = section('Title')
+    children = load_nodes(dump_nodes(sec.children))
+    assert [child.pformat() for child in children] == \
+        [child.pformat() for child in sec.children], \
+        'Serialized nodes must be rebuilt as they were'
+    for child in children:
+        assert child.parent is None
+        for node in child.traverse():
+            assert node is child or node.parent is not None, \
+                'Rebuilt nodes must point to their parents'
+    literal = children[-1]
+    assert literal.rawsource == sec.children[-1].rawsource, \
+        'Raw sources must be kept, e.g for highlighting literal blocks'
+
+
+def test_stored_sections():
+    sections = [section('Title %d' % idx) for idx in range(100)]
+    data = pickle.dumps(sections, 2)
+    assert len(data) < native_size(sections) * 2 / 3, \
+        'Stored sections must pickle compactly'
+
+    loaded = pickle.loads(data)
+    assert '_packed' in loaded[0].__dict__, \
+        'Children of stored sections must be rebuilt lazily'
+    assert loaded[0]['options'] == sections[0]['options']
+    assert loaded[0].pformat() == sections[0].pformat()
+    assert all(child.parent is loaded[0] for child in loaded[0].children)
+
+    # Sections within a document keep their place.
+    doc = nodes.container()
+    doc += section('Title')
+    assert pickle.loads(pickle.dumps(doc, 2))[0].parent is not None
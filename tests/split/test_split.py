@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import gzip
+import json
+import os.path
+import time
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    parts = ['index-wiki-1', 'index-wiki-2', 'index-wiki-3']
+    for docname in parts:
+        assert os.path.exists(os.path.join(app.srcdir, docname + '.rst')), \
+            'Split pages must generate one document per part'
+    assert 'toctree' not in warning.getvalue(), \
+        'Generated documents must be orphans'
+
+    soup = get_html_soup(app, 'index.html')
+    page = soup.find(id='wiki')
+    assert 'Body of the page.' in page.text
+    links = [a['href'] for a in page.find('ul', class_='wikipage-index')
+             .find_all('a')]
+    assert links == ['index-wiki-1.html#a-section',
+                     'index-wiki-2.html#b-section',
+                     'index-wiki-2.html#c-section',
+                     'index-wiki-3.html#d-section'], \
+        'Hosts of split pages must link to the top level sections'
+    assert soup.find(id='b-section') is None, \
+        'Hosts of split pages must not contain their sections'
+
+    soup = get_html_soup(app, 'index-wiki-1.html')
+    assert soup.find(id='a-section').find(id='a-child'), \
+        'Subtrees must be kept in one part'
+    soup = get_html_soup(app, 'index-wiki-2.html')
+    assert soup.find(id='b-section').find('a', {'href': 'index.html#some_func'})
+    assert soup.find(id='c-section') and not soup.find(id='d-section')
+
+    path = os.path.join(app.outdir, '_static', 'wikisearch.json.gz')
+    with gzip.open(path) as f:
+        index = json.loads(f.read().decode('utf-8'))
+    assert ['A Child', 'index-wiki-1.html#a-child'] in index['sections'], \
+        'Search results must point to the parts of split pages'
+
+    # Fit the whole page in one part.
+    index_rst = os.path.join(app.srcdir, 'index.rst')
+    with open(index_rst, encoding='utf-8') as f:
+        source = f.read()
+    with open(index_rst, 'w', encoding='utf-8') as f:
+        f.write(source.replace(':split: 2', ':split: 10'))
+    mtime = time.time() + 10
+    os.utime(index_rst, (mtime, mtime))
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        assert sorted(app2.env.wikiparts) == ['index-wiki-1']
+        for docname in parts[1:]:
+            assert not os.path.exists(
+                os.path.join(app.srcdir, docname + '.rst')), \
+                'Generated documents no longer needed must be removed'
+        soup = get_html_soup(app2, 'index-wiki-1.html')
+        assert soup.find(id='d-section')
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html_existing(app, status, warning):
+    path = os.path.join(app.srcdir, 'index-wiki-1.rst')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(u':orphan:\n\nExisting\n========\n')
+    app.build(force_all=True)
+    assert 'index.rst: WARNING: Not splitting wikipage "wiki" into ' + \
+        'existing document index-wiki-1' in warning.getvalue(), \
+        'Documents that are not generated must not be overwritten'
+    with open(path, encoding='utf-8') as f:
+        assert 'Existing' in f.read()
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html_user_part(app, status, warning):
+    mine_rst = os.path.join(app.srcdir, 'mine.rst')
+    with open(mine_rst, 'w', encoding='utf-8') as f:
+        f.write(u':orphan:\n\n.. wikipage:: wiki\n'
+                u'   :title: Mine\n   :part: 1\n')
+    app.build(force_all=True)
+    assert os.path.exists(mine_rst)
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        assert os.path.exists(mine_rst), \
+            'Documents of the user must never be removed'
+        assert 'mine' not in app2.env.wikigenerated
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='latex', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    with open(os.path.join(app.outdir, 'pkg.tex'), encoding='utf-8') as f:
+        assert 'D Section' in f.read(), \
+            'Builders other than HTML must render split pages as a whole'
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_html_existing()
+    test_build_html_user_part()
+    test_build_latex()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from bs4 import BeautifulSoup
+from docutils.parsers.rst import directives
+from sphinx_testing import with_app
+import os.path
+
+from sphinxcontrib.wiki.standalone import WikiStore
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+paths = [os.path.join(srcdir, docname + '.rst')
+         for docname in ['index', 'some_pkg', 'some_pkg.some_mod']]
+
+
+def render():
+    store = WikiStore()
+    for path in paths:
+        store.read(path)
+    return store, BeautifulSoup(store.render(paths[0]), 'html.parser')
+
+
+def section_tree(soup):
+    # (id, ids of all descendant sections) for all sections of the wiki page
+    return [(sec['id'], [child['id'] for child in sec.findAll(
+                'div', {'class': 'section'})])
+            for sec in soup.find(id='wiki').findAll(
+                'div', {'class': 'section'})]
+
+
+def test_standalone():
+    store, soup = render()
+    assert sorted(store.sections) == ['wiki'], \
+        'Sections must be collected in the store'
+    assert 'wikisection' not in directives._directives, \
+        'Directives must not be registered with docutils permanently'
+
+    assert soup.find(id='package-section').find(id='section-of-module'), \
+        'Sections must be placed by document hierarchy'
+    assert soup.find(id='package-section').find(
+        'a', {'href': 'https://example.com/'}), \
+        'References must be resolved in the original document'
+    assert 'Page body.' in soup.text, 'Page bodies must be kept'
+
+    other = BeautifulSoup(store.render(paths[1]), 'html.parser')
+    assert 'Package section body' not in other.text, \
+        'Sections must be removed from their original place'
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    app.builder.build_all()
+    assert section_tree(get_html_soup(app, 'index.html')) == \
+        section_tree(render()[1]), \
+        'Pages must be assembled the same way with and without sphinx'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_standalone()
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+"""
+First paragraph of docs.
+
+.. wikisection:: faq
+    :title: Package Question
+
+    Well...
+
+Second paragraph of docs.
+"""
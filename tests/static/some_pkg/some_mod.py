@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+"""
+.. wikisection:: faq
+    :title: Question in Module
+
+    Well... see :func:`mod_func`.
+"""
+
+
+def mod_func():
+    pass
+
+
+class SomeClass(object):
+    def method(self):
+        """
+        .. wikisection:: todo
+            :title: Fix method
+
+            Do it.
+
+        Other docs.
+        """
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import os.path
+import shutil
+import tempfile
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from sphinxcontrib.wiki import harvest
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def test_harvest():
+    records = harvest.harvest([os.path.join(this_dir, 'some_pkg')])
+    assert [(r['docname'], r['depth'], r['page_name'], r['title'])
+            for r in records] == [
+        ('some_pkg', 1, 'faq', 'Package Question'),
+        ('some_pkg.some_mod', 2, 'faq', 'Question in Module'),
+        ('some_pkg.some_mod', 2, 'todo', 'Fix method'),
+    ], 'Sections must be harvested with their docname and depth'
+    assert records[2]['lines'] == ['Do it.'], \
+        'Section bodies must be harvested without surrounding text'
+    assert records[2]['ref_context'] == {
+        'py:module': 'some_pkg.some_mod',
+        'py:class': 'SomeClass',
+    }, 'Sections must be harvested with their reference context'
+
+
+def _broken_pkg():
+    # A copy of some_pkg with modules that cannot be parsed.
+    tmpdir = tempfile.mkdtemp()
+    pkg = os.path.join(tmpdir, 'some_pkg')
+    shutil.copytree(os.path.join(this_dir, 'some_pkg'), pkg)
+    with open(os.path.join(pkg, 'syntax.py'), 'wb') as f:
+        f.write(b'def broken(:\n    pass\n')
+    with open(os.path.join(pkg, 'latin1.py'), 'wb') as f:
+        f.write(b'"""Caf\xe9."""\n')
+    return tmpdir, pkg
+
+
+def test_harvest_errors():
+    tmpdir, pkg = _broken_pkg()
+    try:
+        errors = []
+        records = harvest.harvest([pkg], errors)
+        assert len(records) == 3, \
+            'Files that cannot be parsed must not stop harvesting'
+        assert sorted(os.path.basename(path) for path, message in errors) == \
+            ['latin1.py', 'syntax.py'], \
+            'Files that cannot be parsed must be reported'
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_build_html_errors():
+    tmpdir, pkg = _broken_pkg()
+    warning = StringIO()
+    app = TestApp(srcdir=srcdir, confoverrides={'wiki_harvest_paths': [pkg]},
+                  status=StringIO(), warning=warning)
+    try:
+        app.builder.build_all()
+        assert 'syntax.py' in warning.getvalue(), \
+            'Files that cannot be parsed must be warned about'
+        soup = get_html_soup(app, 'index.html')
+        assert soup.find(id='question-in-module'), \
+            'Files that cannot be parsed must not stop the build'
+    finally:
+        app.cleanup()
+        shutil.rmtree(tmpdir)
+
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    app.builder.build_all()
+
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find(id='package-question').find(
+        id='question-in-module'), \
+        'Harvested sections must be placed by module hierarchy'
+    assert soup.find(id='question-in-module').find(
+        'a', {'href': '#some_pkg.some_mod.mod_func'}), \
+        'References in harvested sections must be resolved in context'
+    assert soup.find(id='fix-method'), \
+        'Sections in class members must be harvested'
+    assert not soup.find('a', {'href': 'some_pkg.html'}), \
+        'Harvested sections must not link to documents that do not exist'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_harvest()
+    test_harvest_errors()
+    test_build_html_errors()
+    test_build_html()
+    test_build_latex()
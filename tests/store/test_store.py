@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import gzip
+import json
+import os.path
+import time
+
+from sphinxcontrib.wiki import watch
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+def _edit(app, docname, old, new):
+    path = os.path.join(app.srcdir, docname + '.rst')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source.replace(old, new))
+    mtime = time.time() + 10
+    os.utime(path, (mtime, mtime))
+
+
+def _rebuild(app, other_body):
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        soup = get_html_soup(app2, 'index.html')
+        assert soup.find(id='section-title').find(
+            'a', {'href': '#some_func'}), \
+            'Stored sections must be assembled after each build'
+        assert other_body in soup.find(id='other-section').text
+        stores = [filename for filename in os.listdir(app.doctreedir)
+                  if filename.endswith('.store')]
+        assert len(stores) == 1, 'Older section stores must be removed'
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+
+    assert os.path.exists(os.path.join(app.doctreedir,
+                                       app.env.wikistore[0]))
+    for sec_info in app.env.wikisections['wiki']:
+        assert 'stored' in sec_info and not sec_info['node'].children, \
+            'Section bodies must be moved out of the build environment'
+
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find(id='section-title').find('a', {'href': '#some_func'}), \
+        'Stored sections must be assembled with their references'
+
+    path = os.path.join(app.outdir, '_static', 'wikisearch.json.gz')
+    with gzip.open(path) as f:
+        index = json.loads(f.read().decode('utf-8'))
+    assert 'dragons' in index['terms'], 'Stored sections must be indexed'
+
+    # Change one of the two documents.
+    other = os.path.join(app.srcdir, 'other.rst')
+    with open(other, encoding='utf-8') as f:
+        source = f.read()
+    with open(other, 'w', encoding='utf-8') as f:
+        f.write(source.replace('Original', 'Edited'))
+    mtime = time.time() + 10
+    os.utime(other, (mtime, mtime))
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        soup = get_html_soup(app2, 'index.html')
+        assert soup.find(id='section-title').find(
+            'a', {'href': '#some_func'}), \
+            'Sections of unchanged documents must be kept across builds'
+        assert 'Edited body' in soup.find(id='other-section').text, \
+            'Sections of changed documents must be stored again'
+    finally:
+        app2.cleanup()
+
+
+    # Changes picked up by sphinx-wiki-watch leave the store alone, the
+    # pickled build environment is not updated.
+    _edit(app, 'other', 'Edited', 'Watched')
+    app3 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        watch.update(app3, watch.harvest_mtimes(app3))
+        soup = get_html_soup(app3, 'index.html')
+        assert 'Watched body' in soup.find(id='other-section').text
+    finally:
+        app3.cleanup()
+    _rebuild(app, 'Watched body')
+
+    # A lost store is rebuilt by reading the documents it came from again.
+    for filename in os.listdir(app.doctreedir):
+        if filename.endswith('.store'):
+            os.remove(os.path.join(app.doctreedir, filename))
+    _rebuild(app, 'Watched body')
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
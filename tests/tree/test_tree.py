@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from sphinxcontrib.wiki.tree import WikiTree
+
+
+def record(title, depth, parent='_default_'):
+    return {'title': title, 'depth': depth, 'parent': parent}
+
+
+def test_default_parents():
+    tree = WikiTree([
+        record('a', 1),
+        record('b', 2),
+        record('c', 3),
+        record('d', 3),
+        record('e', 1),
+        record('f', 3),
+    ])
+    assert tree.roots == [0, 4], \
+        'Sections of depth 1 must be placed at the top level'
+    assert tree.children == [[1], [2, 3, 5], [], [], [], []], \
+        'Sections must be placed under the last section of closest depth'
+
+
+def test_forced_parents():
+    tree = WikiTree([
+        record('a', 2, parent='c'),
+        record('b', 2, parent='_none_'),
+        record('c', 1),
+        record('d', 1, parent='unknown'),
+        record('e', 3),
+    ])
+    assert tree.roots == [2, 3, 1], \
+        'Sections forcing no parent must be appended to the top level'
+    assert tree.children[2] == [0], \
+        'Sections must be placed under their forced parent'
+    assert tree.children[3] == [4], \
+        'Forced parents must not affect placement by depth'
+    assert tree.unknown_parents == [3], \
+        'Unknown parents must be reported and treated as default'
+
+
+def test_many_sections():
+    depths = [1, 2, 3, 3, 2]
+    records = [record(str(idx), depths[idx % len(depths)])
+               for idx in range(100000)]
+    tree = WikiTree(records)
+    assert len(tree.roots) == len(records) // len(depths)
+    assert sum(len(children) for children in tree.children) + \
+        len(tree.roots) == len(records), 'All sections must be placed'
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_default_parents()
+    test_forced_parents()
+    test_many_sections()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+import os.path
+import time
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+
+    assert 'later' not in app.env.wikisections, \
+        'Sections of unhosted pages must be dropped'
+    assert app.env.wikiunhosted == {'later': ['index']}, \
+        'Documents containing sections of unhosted pages must be remembered'
+    assert '1 unhosted wikipages: later' in warning.getvalue(), \
+        'Dropping sections of unhosted pages must issue a warning'
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find(id='hosted-section'), \
+        'Sections of hosted pages must be kept'
+
+    # Host the page in another document.
+    other = os.path.join(app.srcdir, 'other.rst')
+    with open(other, 'a', encoding='utf-8') as f:
+        f.write(u'\n.. wikipage:: later\n   :title: Later Page\n')
+    mtime = time.time() + 10
+    os.utime(other, (mtime, mtime))
+
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        assert not app2.env.wikiunhosted, \
+            'Pages must not be unhosted once they are hosted'
+        soup = get_html_soup(app2, 'other.html')
+        assert soup.find(id='later-section'), \
+            'Dropped sections must be restored once their page is hosted'
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import json
+import os.path
+
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+@with_app(buildername='html', srcdir=srcdir)
+def test_build_html(app, status, warning):
+    # NOTE the report is written upon ``build-finished`` which is only emitted
+    # by the application, not by the builder.
+    app.build(force_all=True)
+    assert os.path.exists(os.path.join(app.outdir, 'index.html'))
+
+    path = os.path.join(app.outdir, 'wiki-unresolved.json')
+    assert os.path.exists(path), 'The unresolved reference report is missing'
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    assert report == [{
+        'docname': 'index',
+        'source': 'index',
+        'section': 'Section Title',
+        'domain': 'py',
+        'reftype': 'func',
+        'target': 'nowhere_to_be_found',
+    }], 'Unresolved references must be reported'
+
+    assert '1 unresolved references in wiki sections' in warning.getvalue()
+
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find('span', text='nowhere_to_be_found()'), \
+        'The text of unresolved references should be kept'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app
+import os.path
+import time
+
+from sphinxcontrib.wiki import watch
+from ..util import get_html_soup
+
+try:
+    from io import open
+except ImportError:
+    pass
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    app.build(force_all=True)
+    mtimes = watch.harvest_mtimes(app)
+    assert watch.update(app, mtimes) == ([], mtimes), \
+        'Nothing must be written if nothing changed'
+
+    sections = os.path.join(app.srcdir, 'sections.rst')
+    with open(sections, encoding='utf-8') as f:
+        source = f.read()
+    with open(sections, 'w', encoding='utf-8') as f:
+        f.write(source.replace('Original', 'Edited'))
+    mtime = time.time() + 10
+    os.utime(sections, (mtime, mtime))
+
+    docnames, mtimes = watch.update(app, mtimes)
+    assert docnames == ['index', 'sections'], \
+        'Only changed documents and hosts of affected pages must be written'
+    assert 'Edited section body.' in get_html_soup(app, 'index.html').text, \
+        'Hosts of affected pages must be written'
+    assert watch.update(app, mtimes) == ([], mtimes), \
+        'Changes must only be picked up once'
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_latex()
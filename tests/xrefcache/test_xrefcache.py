@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from sphinx_testing import with_app, TestApp
+from sphinx.domains.python import PythonDomain
+import os.path
+import pickle
+
+from sphinxcontrib import wiki
+from ..util import get_html_soup
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+srcdir = os.path.join(this_dir, 'docs/')
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html(app, status, warning):
+    # NOTE the cache is saved upon ``build-finished`` which is only emitted
+    # by the application, not by the builder.
+    app.build(force_all=True)
+    soup = get_html_soup(app, 'index.html')
+    assert soup.find('a', {'href': 'api.html#some_func'}), \
+        'References in wiki sections should be resolved'
+    assert app.env.wikisuffixes is None, \
+        'Python object names must only be tabled for refspecific references'
+
+    state_path = os.path.join(app.doctreedir, 'wikistate.pickle')
+    assert os.path.exists(state_path), 'The reference cache must be saved'
+    with open(state_path, 'rb') as f:
+        cache = pickle.load(f)['wikixrefs']
+    assert [ref['todocname'] for ref in cache.values()] == ['api'], \
+        'The reference cache must know where targets are defined'
+
+    def resolve_xref(*args, **kwargs):
+        raise AssertionError('Cached references should not be resolved again')
+
+    # A subsequent build must reuse the cache instead of asking the domain.
+    original = PythonDomain.resolve_xref
+    PythonDomain.resolve_xref = resolve_xref
+    try:
+        app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                       doctreedir=app.doctreedir)
+        try:
+            app2.build(force_all=True)
+            assert app2.env.wikixrefs == cache, \
+                'The reference cache must be loaded from the previous build'
+
+            soup = get_html_soup(app2, 'index.html')
+            assert soup.find('a', {'href': 'api.html#some_func'}), \
+                'Cached references should produce the same links'
+
+            wiki.env_purge_doc(app2, app2.env, 'api')
+            assert not app2.env.wikixrefs, \
+                'Re-reading the defining document must invalidate the cache'
+        finally:
+            app2.cleanup()
+    finally:
+        PythonDomain.resolve_xref = original
+
+
+@with_app(buildername='html', srcdir=srcdir, copy_srcdir_to_tmpdir=True)
+def test_build_html_competing(app, status, warning):
+    with open(os.path.join(app.srcdir, 'mod.rst'), 'w') as f:
+        f.write(':orphan:\n\n.. py:currentmodule:: pkg\n\n'
+                '.. wikisection:: wiki\n   :title: Module Section\n\n'
+                '   Referencing :func:`.some_func`.\n')
+    app.build(force_all=True)
+    soup = get_html_soup(app, 'index.html')
+    links = [a['href'] for a in soup.find_all('a', class_='reference')]
+    assert links.count('api.html#some_func') == 2
+
+    # A function of the same name in the module of the reference.
+    with open(os.path.join(app.srcdir, 'other.rst'), 'w') as f:
+        f.write(':orphan:\n\n.. py:currentmodule:: pkg\n\n'
+                '.. py:function:: some_func()\n')
+    app2 = TestApp(srcdir=app.srcdir, outdir=app.outdir,
+                   doctreedir=app.doctreedir)
+    try:
+        app2.build()
+        soup = get_html_soup(app2, 'index.html')
+        links = [a['href'] for a in soup.find_all('a', class_='reference')]
+        assert 'other.html#pkg.some_func' in links, \
+            'New definitions must invalidate cached references to their names'
+        assert 'api.html#some_func' in links
+    finally:
+        app2.cleanup()
+
+
+@with_app(buildername='latex', srcdir=srcdir)
+def test_build_latex(app, status, warning):
+    app.builder.build_all()
+    assert os.path.exists(os.path.join(app.outdir, 'pkg.tex'))
+
+
+# for print debugging:
+if __name__ == '__main__':
+    test_build_html()
+    test_build_html_competing()
+    test_build_latex()